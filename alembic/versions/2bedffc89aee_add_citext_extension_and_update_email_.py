@@ -9,6 +9,7 @@ from typing import Sequence, Union
 
 from alembic import op
 import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
 
 # revision identifiers, used by Alembic.
 revision: str = '2bedffc89aee'
@@ -21,26 +22,19 @@ def upgrade() -> None:
     # Ensure citext extension exists (idempotent - safe to run multiple times)
     op.execute("CREATE EXTENSION IF NOT EXISTS citext")
     
-    # Alter email column to CITEXT if it's not already CITEXT
+    # Alter email column to CITEXT.
     # This handles the case where the database was created with String(255)
     # before this migration was applied. The initial migration already uses CITEXT,
-    # so this is mainly for databases that were created before the model was updated.
-    op.execute("""
-        DO $$
-        BEGIN
-            -- Check if column exists and is not already citext
-            IF EXISTS (
-                SELECT 1 
-                FROM information_schema.columns c
-                JOIN pg_type t ON t.typname = c.udt_name
-                WHERE c.table_name = 'users' 
-                AND c.column_name = 'email'
-                AND t.typname != 'citext'
-            ) THEN
-                ALTER TABLE users ALTER COLUMN email TYPE citext USING email::citext;
-            END IF;
-        END $$;
-    """)
+    # in which case email::citext is a no-op cast and the table is not rewritten.
+    # Fail fast instead of queueing behind (and blocking) writers on busy tables.
+    op.execute("SET LOCAL lock_timeout = '2s'")
+    op.alter_column(
+        'users',
+        'email',
+        type_=postgresql.CITEXT(),
+        existing_nullable=False,
+        postgresql_using='email::citext',
+    )
 
 
 def downgrade() -> None:
@@ -0,0 +1,35 @@
+"""replace_redundant_email_index_with_partial_index
+
+Revision ID: 4b491b850e43
+Revises: 2bedffc89aee
+Create Date: 2026-10-15 09:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '4b491b850e43'
+down_revision: Union[str, None] = '2bedffc89aee'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # uq_users_email is already backed by a unique btree index on email, so
+    # ix_users_email only duplicated it (extra write cost on every INSERT/UPDATE).
+    op.drop_index('ix_users_email', table_name='users')
+    # Partial index for login lookups, which only consider active users
+    op.create_index(
+        'ix_users_email_active',
+        'users',
+        ['email'],
+        postgresql_where=sa.text('is_active'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_email_active', table_name='users')
+    op.create_index('ix_users_email', 'users', ['email'])
@@ -22,8 +22,12 @@ def upgrade() -> None:
     # Create PostgreSQL extensions
     # citext is needed for case-insensitive email fields
     op.execute("CREATE EXTENSION IF NOT EXISTS citext")
-    # pgcrypto is needed for gen_random_uuid() function used in UUID primary keys
-    op.execute("CREATE EXTENSION IF NOT EXISTS pgcrypto")
+    # gen_random_uuid() (used for UUID primary keys) is built into PostgreSQL 13+;
+    # only older servers need pgcrypto for it. Offline (--sql) runs have no
+    # server version, so emit the extension there to stay on the safe side.
+    server_version = op.get_bind().dialect.server_version_info
+    if server_version is None or server_version < (13,):
+        op.execute("CREATE EXTENSION IF NOT EXISTS pgcrypto")
 
     # Create users table
     # Note: This migration only includes tables defined in current SQLAlchemy models.
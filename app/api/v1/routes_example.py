@@ -1,14 +1,25 @@
 from fastapi import APIRouter, Depends
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.deps.db import get_db_session
+from app.schemas.health import HealthStatus
 
 
 router = APIRouter()
 
 
 @router.get("/health", summary="Health check")
-async def health_check(db: AsyncSession = Depends(get_db_session)) -> dict:
-    # Optionally, perform a very cheap DB check here in the future.
-    return {"status": "ok"}
+async def health_check() -> HealthStatus:
+    # Liveness only: no DB session, so probes don't consume pool connections.
+    # The declared return type lets FastAPI serialize straight to JSON bytes
+    # via Pydantic; don't set a custom response_class, it disables that path.
+    return HealthStatus(status="ok")
 
+
+@router.get("/health/db", summary="Database health check")
+async def health_check_db(
+    db: AsyncSession = Depends(get_db_session, scope="function"),
+) -> HealthStatus:
+    await db.execute(text("SELECT 1"))
+    return HealthStatus(status="ok")
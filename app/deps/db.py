@@ -7,64 +7,78 @@ lifespan handling and error management.
 
 import logging
 from collections.abc import AsyncGenerator
-from contextlib import asynccontextmanager
+from contextlib import AsyncExitStack, asynccontextmanager
 
 from fastapi import HTTPException
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import AsyncSessionLocal
+from app.db.session import get_sessionmaker
 
 logger = logging.getLogger(__name__)
 
 
+# Errors from opening the session or committing it that are answered with
+# a generic 500; anything raised by the endpoint propagates unchanged.
+_SESSION_ERRORS = (SQLAlchemyError, ValueError, LookupError)
+
+
+def _session_error(exc: Exception) -> HTTPException:
+    """Log a session setup/commit failure and map it to a generic 500."""
+    if isinstance(exc, SQLAlchemyError):
+        logger.error("Database error: %s", str(exc), exc_info=exc)
+        return HTTPException(
+            status_code=500,
+            detail="Database operation failed. Please try again later.",
+        )
+    logger.error("Unexpected error in database session: %s", str(exc), exc_info=exc)
+    return HTTPException(
+        status_code=500,
+        detail="An unexpected error occurred. Please try again later.",
+    )
+
+
 @asynccontextmanager
 async def _get_db_session_context() -> AsyncGenerator[AsyncSession, None]:
     """
     Context manager for database session with proper error handling.
     
-    Ensures session is properly closed even if exceptions occur.
+    The session is closed by the session factory's own context manager;
+    this wrapper only adds commit/rollback and error translation.
+    
+    Only failures to open or commit the session are translated. Exceptions
+    raised while the session is in use (by the endpoint or a repository)
+    roll the transaction back and propagate unchanged.
     
     Yields:
         AsyncSession: Database session
         
     Raises:
-        HTTPException: If database connection fails
+        HTTPException: If opening or committing the session fails
     """
-    session = None
-    try:
-        async with AsyncSessionLocal() as session:
+    async with AsyncExitStack() as stack:
+        try:
+            session = await stack.enter_async_context(get_sessionmaker()())
+        except _SESSION_ERRORS as e:
+            raise _session_error(e) from e
+        
+        try:
             yield session
-            # Commit if no exception occurred
-            await session.commit()
-    except SQLAlchemyError as e:
-        logger.error("Database error: %s", str(e), exc_info=True)
-        if session:
+        except BaseException:
+            # Rollback and re-raise. Endpoint errors, HTTPExceptions and
+            # client cancellations (CancelledError) propagate unchanged and
+            # are not logged here as database errors.
             await session.rollback()
-        raise HTTPException(
-            status_code=500,
-            detail="Database operation failed. Please try again later.",
-        ) from e
-    except Exception as e:
-        logger.error("Unexpected error in database session: %s", str(e), exc_info=True)
-        if session:
+            raise
+        
+        try:
+            await session.commit()
+        except _SESSION_ERRORS as e:
             await session.rollback()
-        raise HTTPException(
-            status_code=500,
-            detail="An unexpected error occurred. Please try again later.",
-        ) from e
-    except BaseException:
-        # CancelledError, SystemExit, etc.: rollback and re-raise (no 500)
-        if session:
+            raise _session_error(e) from e
+        except BaseException:
             await session.rollback()
-        raise
-    finally:
-        # Ensure session is closed
-        if session:
-            try:
-                await session.close()
-            except Exception as e:
-                logger.warning("Error closing session: %s", str(e), exc_info=True)
+            raise
 
 
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
@@ -75,7 +89,14 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     - Automatic transaction management (commit on success, rollback on error)
     - Proper session cleanup
     - Production-ready error handling
-    - Connection pooling via AsyncSessionLocal
+    - Connection pooling via the shared engine (see app.db.session)
+    
+    Declare it with ``scope="function"`` so the commit/rollback runs when the
+    path operation returns, *before* the response is sent. With the default
+    (request) scope FastAPI finalizes yield dependencies after the response,
+    so a client could receive 200 OK for a transaction that later fails to
+    commit. Use the same scope everywhere: FastAPI keys its per-request
+    dependency cache on it, so mixing scopes would open two sessions.
     
     Usage:
         ```python
@@ -84,7 +105,7 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
         
         @router.get("/items")
         async def list_items(
-            session: AsyncSession = Depends(get_db_session)
+            session: AsyncSession = Depends(get_db_session, scope="function")
         ):
             # Use session for database operations
             result = await session.execute(select(Item))
@@ -95,7 +116,7 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
         AsyncSession: Database session ready for use
         
     Raises:
-        HTTPException: If database connection fails (500 status)
+        HTTPException: If opening or committing the session fails (500 status)
     """
     async with _get_db_session_context() as session:
         yield session
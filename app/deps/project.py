@@ -6,16 +6,46 @@ from request.state (set by middleware) for multi-tenant repositories.
 """
 
 import logging
+import re
 import uuid
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Annotated, Optional
 
 from fastapi import Header, HTTPException, Query, Request
 
 logger = logging.getLogger(__name__)
 
+# 400 details; a fresh HTTPException is raised per request
+_MISSING_HEADER = "X-Project-ID header is required"
+_MISSING_QUERY = "project_id query parameter is required"
+# Prefix for the per-value 400 detail (plain concatenation, no formatting)
+_INVALID_PROJECT_ID = "Invalid project ID format: "
 
-@dataclass
+
+# Canonical 8-4-4-4-12 form only; uuid.UUID() alone would also accept
+# braces, "urn:uuid:" prefixes and undashed hex.
+_UUID_RE = re.compile(
+    r"\A[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\Z"
+)
+
+
+@lru_cache(maxsize=4096)
+def _parse_uuid_cached(raw: str) -> uuid.UUID:
+    """
+    Parse a canonical project ID string into a UUID, memoizing successful parses.
+
+    Tenant cardinality is low, so repeated IDs become a dict lookup. Invalid
+    or non-canonical input raises ValueError and is not cached.
+    """
+    # Invalid input is never cached, so reject wrong lengths before the regex
+    if len(raw) != 36 or not _UUID_RE.match(raw):
+        raise ValueError(f"Not a canonical UUID: {raw!r}")
+    # Format already validated, so skip uuid.UUID's string normalization
+    return uuid.UUID(int=int(raw.replace("-", ""), 16))
+
+
+@dataclass(slots=True, frozen=True)
 class ProjectContext:
     """
     Project context extracted from request state.
@@ -41,13 +71,24 @@ async def get_project_context(request: Request) -> ProjectContext:
     """
     Extract project context from request.state (set by middleware).
 
-    Fails with 400 when project_id was not provided; 500 only on invalid server state.
+    Falls back to a ``project_id`` path parameter, which the middleware
+    cannot see because it runs before routing. Fails with 400 when
+    project_id was not provided; 500 only on invalid server state.
 
     Raises:
         HTTPException: 400 if project context missing, 500 if invalid configuration.
     """
     try:
         if not hasattr(request.state, "project_context"):
+            path_project_id = request.path_params.get("project_id")
+            if path_project_id:
+                try:
+                    return ProjectContext(project_id=_parse_uuid_cached(path_project_id))
+                except ValueError:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Invalid project ID format in path: {path_project_id}",
+                    )
             logger.warning(
                 "Project context not found in request.state. "
                 "Ensure middleware sets request.state.project_context"
@@ -74,9 +115,9 @@ async def get_project_context(request: Request) -> ProjectContext:
                 detail="Project ID is required but was not provided.",
             )
         return context
-    except HTTPException:
-        raise
-    except Exception as e:
+    except (AttributeError, LookupError, ValueError) as e:
+        # Only state-access failures are translated; anything else is a bug
+        # and propagates unchanged.
         logger.error("Unexpected error extracting project context: %s", str(e), exc_info=True)
         raise HTTPException(
             status_code=500,
@@ -120,37 +161,32 @@ async def get_project_id_from_header(
         ```
     """
     if not x_project_id:
-        raise HTTPException(
-            status_code=400,
-            detail="X-Project-ID header is required",
-        )
+        raise HTTPException(status_code=400, detail=_MISSING_HEADER)
 
     try:
-        return uuid.UUID(x_project_id)
+        return _parse_uuid_cached(x_project_id)
     except ValueError:
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid project ID format: {x_project_id}",
+            detail=_INVALID_PROJECT_ID + x_project_id,
         )
 
 
 async def get_project_id_from_query(request: Request) -> uuid.UUID:
-    values = request.query_params.getlist("project_id")
-
-    if not values or not values[0]:
-        raise HTTPException(
-            status_code=400,
-            detail="project_id query parameter is required",
-        )
+    query_params = request.query_params
+    # Membership is a dict lookup; only scan for the first value when present.
+    # (query_params.get() would return the *last* duplicate, not the first.)
+    raw = query_params.getlist("project_id")[0] if "project_id" in query_params else None
 
-    raw = values[0]
+    if not raw:
+        raise HTTPException(status_code=400, detail=_MISSING_QUERY)
 
     try:
-        return uuid.UUID(raw)
+        return _parse_uuid_cached(raw)
     except ValueError:
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid project ID format: {raw}",
+            detail=_INVALID_PROJECT_ID + raw,
         )
 
 
@@ -181,9 +217,9 @@ async def get_project_id_from_path(
         ```
     """
     try:
-        return uuid.UUID(project_id)
+        return _parse_uuid_cached(project_id)
     except ValueError:
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid project ID format: {project_id}",
+            detail=_INVALID_PROJECT_ID + project_id,
         )
@@ -7,7 +7,8 @@ project_id injection from request context.
 
 import logging
 import uuid
-from typing import Callable, Generic, Type, TypeVar
+from functools import cache
+from typing import Awaitable, Callable, Generic, Type, TypeVar
 
 from fastapi import Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -22,15 +23,20 @@ logger = logging.getLogger(__name__)
 RepositoryType = TypeVar("RepositoryType", bound=BaseRepository)
 
 
+@cache
 def get_repository_factory(
     repository_class: Type[RepositoryType],
-) -> Callable[[AsyncSession, ProjectContext], RepositoryType]:
+) -> Callable[[AsyncSession, ProjectContext], Awaitable[RepositoryType]]:
     """
     Create a repository factory function for a specific repository class.
     
     This factory automatically injects project_id from the project context,
     reducing boilerplate in route handlers.
     
+    Factories are memoized per repository class: FastAPI caches dependencies
+    per request by callable identity, so every declaration of the same
+    repository must resolve to the same factory object.
+    
     Args:
         repository_class: Repository class that extends BaseRepository
         
@@ -51,8 +57,9 @@ def get_repository_factory(
             return await repo.list()
         ```
     """
-    def factory(
-        session: AsyncSession = Depends(get_db_session),
+    # async so FastAPI calls it on the event loop instead of the threadpool
+    async def factory(
+        session: AsyncSession = Depends(get_db_session, scope="function"),
         context: ProjectContext = Depends(get_project_context),
     ) -> RepositoryType:
         """
@@ -68,14 +75,16 @@ def get_repository_factory(
         try:
             return repository_class(session, context.project_id)
         except ValueError as e:
-            logger.error(f"Failed to create repository {repository_class.__name__}: {str(e)}")
+            logger.error("Failed to create repository %s: %s", repository_class.__name__, e)
             raise HTTPException(
                 status_code=500,
                 detail=f"Failed to initialize repository: {str(e)}",
             ) from e
         except Exception as e:
             logger.error(
-                f"Unexpected error creating repository {repository_class.__name__}: {str(e)}",
+                "Unexpected error creating repository %s: %s",
+                repository_class.__name__,
+                e,
                 exc_info=True
             )
             raise HTTPException(
@@ -88,7 +97,7 @@ def get_repository_factory(
 
 def create_repository_dependency(
     repository_class: Type[RepositoryType],
-) -> Callable[[AsyncSession, ProjectContext], RepositoryType]:
+) -> Callable[[AsyncSession, ProjectContext], Awaitable[RepositoryType]]:
     """
     Create a FastAPI dependency for a repository class.
     
@@ -157,11 +166,13 @@ def get_repository(
     try:
         return repository_class(session, project_id)
     except ValueError as e:
-        logger.error(f"Failed to create repository {repository_class.__name__}: {str(e)}")
+        logger.error("Failed to create repository %s: %s", repository_class.__name__, e)
         raise
     except Exception as e:
         logger.error(
-            f"Unexpected error creating repository {repository_class.__name__}: {str(e)}",
+            "Unexpected error creating repository %s: %s",
+            repository_class.__name__,
+            e,
             exc_info=True
         )
         raise HTTPException(
@@ -5,7 +5,8 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1 import api_router
 from app.core.config import get_settings
-from app.db.session import engine
+from app.db.session import get_engine, prewarm_pool
+from app.middleware import DEFAULT_EXCLUDED_PATH_PREFIXES, ProjectContextMiddleware
 
 
 settings = get_settings()
@@ -13,13 +14,13 @@ settings = get_settings()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup hook: you can add DB checks or other startup tasks here.
-    # Example:
-    # async with engine.begin() as conn:
-    #     await conn.execute(text("SELECT 1"))
+    # Startup hook: fill the connection pool so the first requests don't pay
+    # the connect/auth handshake.
+    if settings.DB_POOL_PREWARM:
+        await prewarm_pool(settings.DB_POOL_SIZE)
     yield
     # Shutdown hook: dispose DB connections.
-    await engine.dispose()
+    await get_engine().dispose()
 
 
 app = FastAPI(
@@ -29,6 +30,14 @@ app = FastAPI(
 )
 
 
+# Middleware added last runs first. Keep every middleware pure ASGI (no
+# BaseHTTPMiddleware) and register CORS last so preflights are answered
+# before any project ID parsing.
+app.add_middleware(
+    ProjectContextMiddleware,
+    exclude_path_prefixes=(*DEFAULT_EXCLUDED_PATH_PREFIXES, f"{settings.API_V1_STR}/health"),
+)
+
 if settings.BACKEND_CORS_ORIGINS:
     app.add_middleware(
         CORSMiddleware,
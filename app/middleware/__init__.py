@@ -1,11 +1,13 @@
 """Middleware for request processing."""
 
 from app.middleware.project_context import (
+    DEFAULT_EXCLUDED_PATH_PREFIXES,
     ProjectContextMiddleware,
     create_project_context_middleware,
 )
 
 __all__ = [
+    "DEFAULT_EXCLUDED_PATH_PREFIXES",
     "ProjectContextMiddleware",
     "create_project_context_middleware",
 ]
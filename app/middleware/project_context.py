@@ -1,123 +1,225 @@
 """
 Middleware for setting project context in request.state.
 
-This middleware extracts project_id from headers/query/path and sets
+This middleware extracts project_id from headers/query and sets
 it in request.state.project_context for use by dependencies.
 """
 
 import logging
 import uuid
-from typing import Callable
+from functools import lru_cache
+from urllib.parse import unquote_plus
 
-from fastapi import Request, HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-from app.deps.project import ProjectContext
+# Shares the dependencies' memoized parser: one canonical-format check and
+# one LRU for every place a project ID string is turned into a UUID.
+from app.deps.project import ProjectContext, _parse_uuid_cached
 
 logger = logging.getLogger(__name__)
 
+# ASGI header names are lowercase bytes, so match raw scope entries directly
+_PROJECT_ID_HEADER = b"x-project-id"
+_PROJECT_ID_QUERY_PREFIX = b"project_id="
 
-class ProjectContextMiddleware(BaseHTTPMiddleware):
+# Paths that never need a project context (API docs); checked before any parsing
+DEFAULT_EXCLUDED_PATH_PREFIXES: tuple[str, ...] = ("/docs", "/redoc", "/openapi.json")
+
+
+async def _send_400(scope: Scope, receive: Receive, send: Send, detail: str) -> None:
+    """
+    Send a 400 response in FastAPI's ``{"detail": ...}`` shape.
+
+    Middleware sits outside FastAPI's exception handlers, so a raised
+    HTTPException would surface as a 500; respond directly instead.
+    """
+    await JSONResponse({"detail": detail}, status_code=400)(scope, receive, send)
+
+
+@lru_cache(maxsize=1024)
+def _context_for(project_id: uuid.UUID) -> ProjectContext:
+    """Return a shared ProjectContext per project (safe to share: it is frozen)."""
+    return ProjectContext(project_id=project_id)
+
+
+def _extract_project_id(
+    scope: Scope,
+    project_path_prefixes: tuple[str, ...] = (),
+) -> uuid.UUID | None:
+    """
+    Extract project_id from an HTTP scope: header, then query, then path.
+
+    Middleware runs before routing, so scope["path_params"] is not populated
+    yet. The path is only checked for the first segment after one of
+    ``project_path_prefixes`` (e.g. "/api/v1/projects/"); other project_id
+    path parameters are resolved after routing by get_project_context.
+
+    Returns:
+        Parsed project UUID, or None if no source provides one
+
+    Raises:
+        ValueError: If project_id is present but invalid; the message is
+            the error detail for the client
+    """
+    # 1. X-Project-ID header (ASGI header names are lowercase bytes)
+    for name, value in scope["headers"]:
+        if name == _PROJECT_ID_HEADER:
+            x_project_id = value.decode("latin-1")
+            if x_project_id:
+                try:
+                    return _parse_uuid_cached(x_project_id)
+                except ValueError:
+                    raise ValueError(f"Invalid project ID format in header: {x_project_id}") from None
+            break
+
+    # 2. project_id query parameter
+    query_string = scope.get("query_string")
+    if query_string:
+        for pair in query_string.split(b"&"):
+            if pair.startswith(_PROJECT_ID_QUERY_PREFIX):
+                query_project_id = unquote_plus(
+                    pair[len(_PROJECT_ID_QUERY_PREFIX):].decode("latin-1")
+                )
+                if query_project_id:
+                    try:
+                        return _parse_uuid_cached(query_project_id)
+                    except ValueError:
+                        raise ValueError(
+                            f"Invalid project ID format in query: {query_project_id}"
+                        ) from None
+                break
+
+    # 3. First path segment after a configured project path prefix
+    path = scope["path"]
+    for prefix in project_path_prefixes:
+        if path.startswith(prefix):
+            path_project_id = path[len(prefix):].partition("/")[0]
+            if path_project_id:
+                try:
+                    return _parse_uuid_cached(path_project_id)
+                except ValueError:
+                    raise ValueError(f"Invalid project ID format in path: {path_project_id}") from None
+            break
+
+    return None
+
+
+class ProjectContextMiddleware:
     """
     Middleware that extracts project context and sets it in request.state.
     
     This middleware looks for project_id in the following order:
     1. X-Project-ID header
     2. project_id query parameter
-    3. project_id path parameter (if route includes it)
+    3. The path segment following one of ``project_path_prefixes``
+    
+    Other project_id path parameters are resolved later by
+    get_project_context, since they only exist once the request is routed.
     
     The extracted project_id is stored in request.state.project_context
     as a ProjectContext instance.
     
+    Implemented as plain ASGI middleware: it reads the raw scope instead of
+    building Request/Response objects and does not spawn an extra task per
+    request like BaseHTTPMiddleware.
+    
+    Requests whose path equals, or lies under, one of ``exclude_path_prefixes``
+    (API docs by default) are passed through untouched. Prefixes match whole
+    path segments, so ``/docs`` does not exclude ``/docsearch``.
+    
     Usage:
         ```python
         from app.middleware.project_context import ProjectContextMiddleware
         
         app.add_middleware(ProjectContextMiddleware)
+        
+        # Also read /api/v1/projects/{project_id}/... before routing
+        app.add_middleware(
+            ProjectContextMiddleware,
+            project_path_prefixes=("/api/v1/projects/",),
+        )
         ```
     """
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def __init__(
+        self,
+        app: ASGIApp,
+        exclude_path_prefixes: tuple[str, ...] = DEFAULT_EXCLUDED_PATH_PREFIXES,
+        project_path_prefixes: tuple[str, ...] = (),
+    ) -> None:
+        self.app = app
+        self.exclude_path_prefixes = tuple(exclude_path_prefixes)
+        # Match whole path segments: "/api/v1/health" excludes itself and
+        # "/api/v1/health/...", not "/api/v1/healthcare"
+        self._excluded_paths = frozenset(p.rstrip("/") for p in self.exclude_path_prefixes)
+        self._excluded_subtrees = tuple(p.rstrip("/") + "/" for p in self.exclude_path_prefixes)
+        self.project_path_prefixes = tuple(project_path_prefixes)
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Process request and set project context.
         
         Args:
-            request: FastAPI request
-            call_next: Next middleware/handler
-            
-        Returns:
-            Response from next handler
-            
-        Raises:
-            HTTPException: If project_id is required but missing
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
+        
+        Invalid project IDs are answered with a 400 response; the wrapped
+        app is not called.
         """
-        project_id = None
+        # OPTIONS (CORS preflight) and excluded paths (docs, health checks)
+        # never need a project context
+        if (
+            scope["type"] != "http"
+            or scope["method"] == "OPTIONS"
+            or scope["path"] in self._excluded_paths
+            or scope["path"].startswith(self._excluded_subtrees)
+        ):
+            await self.app(scope, receive, send)
+            return
         
-        # Try to extract project_id from various sources
-        # 1. Check X-Project-ID header
-        x_project_id = request.headers.get("X-Project-ID")
-        if x_project_id:
-            try:
-                project_id = uuid.UUID(x_project_id)
-            except ValueError:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Invalid project ID format in header: {x_project_id}",
-                )
+        try:
+            project_id = _extract_project_id(scope, self.project_path_prefixes)
+            if project_id is None:
+                project_id = self._on_missing(scope)
+        except ValueError as exc:
+            await _send_400(scope, receive, send, str(exc))
+            return
         
-        # 2. Check query parameter
-        if not project_id:
-            query_project_id = request.query_params.get("project_id")
-            if query_project_id:
-                try:
-                    project_id = uuid.UUID(query_project_id)
-                except ValueError:
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"Invalid project ID format in query: {query_project_id}",
-                    )
+        # Set project context in request.state (backed by scope["state"])
+        if project_id:
+            scope.setdefault("state", {})["project_context"] = _context_for(project_id)
         
-        # 3. Check path parameter (if available)
-        if not project_id and "project_id" in request.path_params:
-            path_project_id = request.path_params.get("project_id")
-            if path_project_id:
-                try:
-                    project_id = uuid.UUID(path_project_id)
-                except ValueError:
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"Invalid project ID format in path: {path_project_id}",
-                    )
+        await self.app(scope, receive, send)
+    
+    def _on_missing(self, scope: Scope) -> uuid.UUID | None:
+        """
+        Decide what to do when the request carries no project_id.
         
-        # Set project context in request.state
-        if project_id:
-            request.state.project_context = ProjectContext(project_id=project_id)
-        else:
-            # If project_id is not found, you can either:
-            # 1. Set a default (not recommended for multi-tenant)
-            # 2. Leave it unset and let dependencies handle the error
-            # 3. Only set for specific routes (recommended)
-            # For now, we'll leave it unset and let dependencies handle it
-            pass
+        Return a project_id to use instead, None to leave the context unset,
+        or raise ValueError to answer with a 400 carrying its message.
         
-        response = await call_next(request)
-        return response
+        By default the context is left unset and the project dependencies
+        report the missing ID for routes that need one.
+        """
+        return None
 
 
 def create_project_context_middleware(
     require_project_id: bool = True,
     default_project_id: uuid.UUID | None = None,
-) -> type[BaseHTTPMiddleware]:
+) -> type[ProjectContextMiddleware]:
     """
     Create a project context middleware with custom configuration.
     
     Args:
-        require_project_id: If True, raise 400 error when project_id is missing
+        require_project_id: If True, respond with 400 when project_id is missing
+            from the header, query and configured path prefixes
         default_project_id: Optional default project_id to use if not found
         
     Returns:
-        Middleware class configured with the specified options
+        ProjectContextMiddleware subclass configured with the specified options
         
     Example:
         ```python
@@ -133,59 +235,13 @@ def create_project_context_middleware(
         app.add_middleware(middleware)
         ```
     """
-    class ConfiguredProjectContextMiddleware(BaseHTTPMiddleware):
-        async def dispatch(self, request: Request, call_next: Callable) -> Response:
-            project_id = None
-            
-            # Try to extract project_id from various sources
-            x_project_id = request.headers.get("X-Project-ID")
-            if x_project_id:
-                try:
-                    project_id = uuid.UUID(x_project_id)
-                except ValueError:
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"Invalid project ID format in header: {x_project_id}",
-                    )
-            
-            if not project_id:
-                query_project_id = request.query_params.get("project_id")
-                if query_project_id:
-                    try:
-                        project_id = uuid.UUID(query_project_id)
-                    except ValueError:
-                        raise HTTPException(
-                            status_code=400,
-                            detail=f"Invalid project ID format in query: {query_project_id}",
-                        )
-            
-            if not project_id and "project_id" in request.path_params:
-                path_project_id = request.path_params.get("project_id")
-                if path_project_id:
-                    try:
-                        project_id = uuid.UUID(path_project_id)
-                    except ValueError:
-                        raise HTTPException(
-                            status_code=400,
-                            detail=f"Invalid project ID format in path: {path_project_id}",
-                        )
-            
-            # Handle missing project_id
-            if not project_id:
-                if require_project_id:
-                    raise HTTPException(
-                        status_code=400,
-                        detail="Project ID is required. Provide it via X-Project-ID header, "
-                               "project_id query parameter, or project_id path parameter.",
-                    )
-                elif default_project_id:
-                    project_id = default_project_id
-            
-            # Set project context
-            if project_id:
-                request.state.project_context = ProjectContext(project_id=project_id)
-            
-            response = await call_next(request)
-            return response
+    class ConfiguredProjectContextMiddleware(ProjectContextMiddleware):
+        def _on_missing(self, scope: Scope) -> uuid.UUID | None:
+            if require_project_id:
+                raise ValueError(
+                    "Project ID is required. Provide it via X-Project-ID header "
+                    "or project_id query parameter."
+                )
+            return default_project_id
     
     return ConfiguredProjectContextMiddleware
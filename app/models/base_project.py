@@ -9,9 +9,9 @@ import uuid
 from datetime import datetime
 from typing import Annotated, Optional
 
-from sqlalchemy import ForeignKey, text
+from sqlalchemy import ForeignKey, Index, event, text
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.orm import Mapped, Session, declared_attr, mapped_column
 
 from app.db.base import Base
 from app.models.base_uuid import BaseUUIDModel
@@ -24,6 +24,9 @@ class ProjectScopedMixin(Base):
     All project-scoped entities must include this mixin to ensure
     multi-tenant isolation.
 
+    project_id is not indexed on its own; BaseProjectModel adds a composite
+    index led by project_id instead.
+
     Example:
         ```python
         class RFQ(BaseUUIDModel, ProjectScopedMixin):
@@ -38,11 +41,23 @@ class ProjectScopedMixin(Base):
         UUID(as_uuid=True),
         ForeignKey("projects.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
         comment="Project (tenant) identifier for multi-tenant isolation",
     )
 
 
+@event.listens_for(Session, "before_flush")
+def _require_project_id(session: Session, flush_context, instances) -> None:
+    """
+    Reject new project-scoped rows without a project_id before they are flushed.
+
+    Fails in-process with ValueError instead of a round trip that ends in
+    the database's NOT NULL IntegrityError.
+    """
+    for instance in session.new:
+        if isinstance(instance, ProjectScopedMixin) and instance.project_id is None:
+            raise ValueError(f"{type(instance).__name__} requires a project_id")
+
+
 class SoftDeleteMixin(Base):
     """
     Mixin that adds soft delete support via deleted_at timestamp.
@@ -50,6 +65,10 @@ class SoftDeleteMixin(Base):
     Models using this mixin will be filtered out of queries by default
     unless include_deleted=True is explicitly passed.
 
+    deleted_at is not indexed on its own: almost every query filters on
+    ``deleted_at IS NULL``, which BaseProjectModelWithSoftDelete serves with
+    a partial index instead.
+
     Example:
         ```python
         class RFQ(BaseUUIDModel, ProjectScopedMixin, SoftDeleteMixin):
@@ -63,11 +82,34 @@ class SoftDeleteMixin(Base):
     deleted_at: Mapped[Optional[datetime]] = mapped_column(
         default=None,
         nullable=True,
-        index=True,
         comment="Timestamp when record was soft deleted (NULL if active)",
     )
 
 
+def _project_index_columns(cls: type) -> tuple[str, ...]:
+    """
+    Columns for a model's project index: project_id, then created_at if the
+    model defines it (BaseRepository.list orders by created_at by default).
+    """
+    has_created_at = any(
+        "created_at" in vars(klass) or "created_at" in vars(klass).get("__annotations__", {})
+        for klass in cls.__mro__
+    )
+    return ("project_id", "created_at") if has_created_at else ("project_id",)
+
+
+def project_active_index(cls: type) -> Index:
+    """
+    Partial index ``ix_<table>_project_active`` over active rows
+    (``deleted_at IS NULL``), on the same columns as the project index.
+    """
+    return Index(
+        f"ix_{cls.__tablename__}_project_active",
+        *_project_index_columns(cls),
+        postgresql_where=text("deleted_at IS NULL"),
+    )
+
+
 class BaseProjectModel(BaseUUIDModel, ProjectScopedMixin):
     """
     Base model for project-scoped entities.
@@ -75,6 +117,17 @@ class BaseProjectModel(BaseUUIDModel, ProjectScopedMixin):
     Combines UUID primary key with project_id for multi-tenant isolation.
     Use this as a base class for all project-scoped entities.
 
+    Each table gets an index ``ix_<table>_project`` on
+    (project_id, created_at), or on project_id alone if the model has no
+    created_at column. Subclasses that need extra table arguments should
+    extend :meth:`project_table_args` rather than replace it:
+
+        ```python
+        @declared_attr.directive
+        def __table_args__(cls):
+            return (*cls.project_table_args(), UniqueConstraint(...))
+        ```
+
     Example:
         ```python
         class RFQ(BaseProjectModel):
@@ -86,6 +139,15 @@ class BaseProjectModel(BaseUUIDModel, ProjectScopedMixin):
 
     __abstract__ = True
 
+    @classmethod
+    def project_table_args(cls) -> tuple:
+        """Return the indexes every project-scoped table needs."""
+        return (Index(f"ix_{cls.__tablename__}_project", *_project_index_columns(cls)),)
+
+    @declared_attr.directive
+    def __table_args__(cls) -> tuple:
+        return cls.project_table_args()
+
 
 class BaseProjectModelWithSoftDelete(BaseProjectModel, SoftDeleteMixin):
     """
@@ -94,6 +156,10 @@ class BaseProjectModelWithSoftDelete(BaseProjectModel, SoftDeleteMixin):
     Combines UUID primary key, project_id, and soft delete capability.
     Use this for entities that should support soft deletion.
 
+    In addition to ``ix_<table>_project``, each table gets a partial index
+    ``ix_<table>_project_active`` on the same columns covering only active
+    rows (``deleted_at IS NULL``), which is what default queries filter on.
+
     Example:
         ```python
         class RFQ(BaseProjectModelWithSoftDelete):
@@ -104,3 +170,8 @@ class BaseProjectModelWithSoftDelete(BaseProjectModel, SoftDeleteMixin):
     """
 
     __abstract__ = True
+
+    @classmethod
+    def project_table_args(cls) -> tuple:
+        """Return the project indexes plus the partial index over active rows."""
+        return (*super().project_table_args(), project_active_index(cls))
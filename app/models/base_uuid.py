@@ -1,3 +1,5 @@
+import os
+import time
 import uuid
 from typing import Annotated
 
@@ -8,11 +10,33 @@ from sqlalchemy.orm import Mapped, mapped_column
 from app.db.base import Base
 
 
+def uuid7() -> uuid.UUID:
+    """
+    Generate a time-ordered UUIDv7 (RFC 9562): 48-bit Unix milliseconds,
+    then 74 random bits.
+
+    New keys land on the rightmost btree page instead of a random one, so
+    inserts don't split pages across the whole primary key index.
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+    return uuid.UUID(
+        int=(timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+        | 0x7 << 76  # version
+        | (rand >> 68) << 64  # rand_a, 12 bits
+        | 0b10 << 62  # RFC 9562 variant
+        | rand & 0x3FFF_FFFF_FFFF_FFFF  # rand_b, 62 bits
+    )
+
+
+# IDs are generated client-side as UUIDv7 (no pg extension needed); the
+# gen_random_uuid() server default only covers rows inserted with raw SQL.
 UUID_PK = Annotated[
     uuid.UUID,
     mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
+        default=uuid7,
         server_default=text("gen_random_uuid()"),
     ),
 ]
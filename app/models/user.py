@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import String, func
+from sqlalchemy import Index, String, UniqueConstraint, func, text
 from sqlalchemy.dialects.postgresql import CITEXT
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -9,11 +9,15 @@ from app.models.base_uuid import BaseUUIDModel
 
 class User(BaseUUIDModel):
     __tablename__ = "users"
+    __table_args__ = (
+        UniqueConstraint("email", name="uq_users_email"),
+        # The unique constraint already indexes email; this partial index
+        # serves login lookups, which only consider active users.
+        Index("ix_users_email_active", "email", postgresql_where=text("is_active")),
+    )
 
     email: Mapped[str] = mapped_column(
         CITEXT(),
-        unique=True,
-        index=True,
         nullable=False,
     )
     full_name: Mapped[str | None] = mapped_column(String(255))
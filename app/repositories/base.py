@@ -10,17 +10,108 @@ This repository enforces strict project-level isolation by:
 
 import uuid
 from datetime import datetime, timezone
-from typing import Any, Generic, Optional, Type, TypeVar
-
-from sqlalchemy import and_, select, update
+from functools import lru_cache
+from typing import Any, AsyncIterator, Generic, Optional, Sequence, Type, TypeVar
+
+from sqlalchemy import (
+    RowMapping,
+    Select,
+    bindparam,
+    delete,
+    exists,
+    func,
+    insert,
+    inspect,
+    select,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.sql.base import ExecutableOption
 
 from app.db.base import Base
 
 # Type variable for SQLAlchemy models
 ModelType = TypeVar("ModelType", bound=Base)
 
+# A filter shape is the sorted (column name, value is None) pairs of the
+# **filters passed to list()/count(); it fixes the WHERE clause, while the
+# values travel as bind parameters.
+FilterShape = tuple[tuple[str, bool], ...]
+
+
+@lru_cache(maxsize=None)
+def _column_attributes(model: type) -> dict[str, Any]:
+    """Map each mapped column attribute name of ``model`` to its attribute (once per model)."""
+    return {attr.key: getattr(model, attr.key) for attr in inspect(model).column_attrs}
+
+
+@lru_cache(maxsize=None)
+def _model_meta(model: type) -> tuple[bool, bool]:
+    """Return ``(has_project_id, has_soft_delete)`` for ``model`` (once per model)."""
+    return hasattr(model, "project_id"), hasattr(model, "deleted_at")
+
+
+def _apply_filter_shape(query: Select, model: type, filter_shape: FilterShape) -> Select:
+    """Add project, filter and bind parameter placeholders for ``filter_shape``."""
+    columns = _column_attributes(model)
+    query = query.where(model.project_id == bindparam("project_id"))
+    for key, is_null in filter_shape:
+        column = columns[key]
+        # None must compile to IS NULL, not "= NULL"
+        query = query.where(column.is_(None) if is_null else column == bindparam(f"filter_{key}"))
+    return query
+
+
+# Upper bound on ids bound into a single IN (...) by get_many_by_ids
+MAX_IDS_PER_QUERY = 1000
+
+# Bounded so arbitrary filter combinations can't grow the cache (or
+# SQLAlchemy's compiled cache behind it) without limit.
+@lru_cache(maxsize=256)
+def _build_list_stmt(
+    model: type,
+    filter_shape: FilterShape,
+    exclude_deleted: bool,
+    default_order: bool,
+    paginate: bool = True,
+) -> Select:
+    """Build (once per shape) the parameterized SELECT used by BaseRepository.list/stream."""
+    query = _apply_filter_shape(select(model), model, filter_shape)
+    if exclude_deleted:
+        query = query.where(model.deleted_at.is_(None))
+    if default_order:
+        query = query.order_by(model.created_at.desc())
+    if paginate:
+        query = query.offset(bindparam("skip")).limit(bindparam("limit"))
+    return query
+
+
+@lru_cache(maxsize=256)
+def _build_many_by_ids_stmt(model: type, exclude_deleted: bool) -> Select:
+    """Build (once per model) the ``id IN (...)`` SELECT used by get_many_by_ids."""
+    # expanding=True keeps one cached statement regardless of len(ids)
+    query = select(model).where(
+        model.id.in_(bindparam("ids", expanding=True)),
+        model.project_id == bindparam("project_id"),
+    )
+    if exclude_deleted:
+        query = query.where(model.deleted_at.is_(None))
+    return query
+
+
+@lru_cache(maxsize=256)
+def _build_count_stmt(
+    model: type,
+    filter_shape: FilterShape,
+    exclude_deleted: bool,
+) -> Select:
+    """Build (once per shape) the parameterized COUNT used by BaseRepository.count."""
+    query = _apply_filter_shape(select(func.count()).select_from(model), model, filter_shape)
+    if exclude_deleted:
+        query = query.where(model.deleted_at.is_(None))
+    return query
+
 
 class BaseRepository(Generic[ModelType]):
     """
@@ -62,7 +153,8 @@ class BaseRepository(Generic[ModelType]):
         if project_id is None:
             raise ValueError("project_id is required and cannot be None")
 
-        if not hasattr(model, "project_id"):
+        has_project_id, has_soft_delete = _model_meta(model)
+        if not has_project_id:
             raise ValueError(
                 f"Model {model.__name__} must have a 'project_id' attribute "
                 "for multi-tenant isolation"
@@ -71,7 +163,12 @@ class BaseRepository(Generic[ModelType]):
         self.session = session
         self.project_id = project_id
         self.model = model
-        self._has_soft_delete = hasattr(model, "deleted_at")
+        self._has_soft_delete = has_soft_delete
+
+        # Filter clauses are built once per repository and reused by every
+        # query instead of being rebuilt through operator overloading per call.
+        self._project_filter = model.project_id == bindparam("project_id", value=project_id)
+        self._soft_delete_filter = model.deleted_at.is_(None) if self._has_soft_delete else None
 
     def _enforce_project_filter(self, query: Any) -> Any:
         """
@@ -86,7 +183,7 @@ class BaseRepository(Generic[ModelType]):
         Returns:
             Query with project_id filter applied
         """
-        return query.where(self.model.project_id == self.project_id)
+        return query.where(self._project_filter)
 
     def _check_project_id(self, data: dict[str, Any]) -> dict[str, Any]:
         """
@@ -104,14 +201,14 @@ class BaseRepository(Generic[ModelType]):
         Raises:
             ValueError: If project_id is provided and doesn't match repository's project_id
         """
-        if "project_id" in data:
-            if data["project_id"] != self.project_id:
-                raise ValueError(
-                    f"Cannot set project_id to {data['project_id']}. "
-                    f"This repository is scoped to project {self.project_id}"
-                )
-        else:
-            data["project_id"] = self.project_id
+        # Single lookup; the identity check short-circuits the common case
+        # where project_id was injected from this repository.
+        project_id = data.setdefault("project_id", self.project_id)
+        if project_id is not self.project_id and project_id != self.project_id:
+            raise ValueError(
+                f"Cannot set project_id to {project_id}. "
+                f"This repository is scoped to project {self.project_id}"
+            )
 
         return data
 
@@ -126,13 +223,77 @@ class BaseRepository(Generic[ModelType]):
             Query with soft delete filter applied (if applicable)
         """
         if self._has_soft_delete:
-            return query.where(self.model.deleted_at.is_(None))
+            return query.where(self._soft_delete_filter)
         return query
 
+    async def _refresh_expired(self, instance: ModelType) -> None:
+        """
+        Reload only the column attributes that are still expired.
+
+        INSERT/UPDATE ... RETURNING already populate server-generated values
+        on PostgreSQL, so this is usually a no-op instead of a second SELECT.
+        """
+        expired = inspect(instance).expired_attributes
+        if expired:
+            await self.session.refresh(instance, attribute_names=list(expired))
+
+    def _filter_params(self, filters: dict[str, Any]) -> tuple[FilterShape, dict[str, Any]]:
+        """
+        Split ``**filters`` into a cacheable filter shape and bind parameters.
+
+        Returns:
+            Tuple of (filter shape, bind parameters including project_id)
+
+        Raises:
+            ValueError: If a key is not a mapped column of the model
+                (relationships, properties, typos), rather than silently
+                returning the unfiltered project set
+        """
+        columns = _column_attributes(self.model)
+        params: dict[str, Any] = {"project_id": self.project_id}
+        shape = []
+        for key in sorted(filters):
+            if key not in columns:
+                raise ValueError(f"Unknown filter: {key}")
+            value = filters[key]
+            shape.append((key, value is None))
+            if value is not None:
+                params[f"filter_{key}"] = value
+        return tuple(shape), params
+
+    def _list_query(
+        self,
+        include_deleted: bool,
+        order_by: Optional[Any],
+        options: Optional[Sequence[ExecutableOption]],
+        filters: dict[str, Any],
+        paginate: bool,
+    ) -> tuple[Select, dict[str, Any]]:
+        """Return the (cached) list/stream statement and its bind parameters."""
+        # The statement (project filter, filters, soft delete, default
+        # ordering) is built once per filter shape; only parameters vary.
+        filter_shape, params = self._filter_params(filters)
+        query = _build_list_stmt(
+            self.model,
+            filter_shape,
+            self._has_soft_delete and not include_deleted,
+            order_by is None and "created_at" in _column_attributes(self.model),
+            paginate,
+        )
+
+        # Custom ordering can be any expression, so it is not part of the cache key
+        if order_by is not None:
+            query = query.order_by(order_by)
+        if options:
+            query = query.options(*options)
+        return query, params
+
     async def get_by_id(
         self,
         id: uuid.UUID,
         include_deleted: bool = False,
+        *,
+        options: Optional[Sequence[ExecutableOption]] = None,
     ) -> Optional[ModelType]:
         """
         Get a single record by ID within the current project.
@@ -140,6 +301,8 @@ class BaseRepository(Generic[ModelType]):
         Args:
             id: UUID of the record
             include_deleted: If True, include soft-deleted records (only if model supports it)
+            options: Loader options, e.g. ``[selectinload(RFQ.line_items)]``, so
+                relationships are loaded up front instead of lazily (N+1)
 
         Returns:
             Model instance or None if not found
@@ -147,6 +310,9 @@ class BaseRepository(Generic[ModelType]):
         Example:
             ```python
             rfq = await repository.get_by_id(rfq_id)
+
+            # Load line items in the same call
+            rfq = await repository.get_by_id(rfq_id, options=[selectinload(RFQ.line_items)])
             ```
         """
         query = select(self.model).where(self.model.id == id)
@@ -158,15 +324,67 @@ class BaseRepository(Generic[ModelType]):
         if not include_deleted:
             query = self._apply_soft_delete_filter(query)
 
+        if options:
+            query = query.options(*options)
+
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
 
+    async def get_many_by_ids(
+        self,
+        ids: Sequence[uuid.UUID],
+        include_deleted: bool = False,
+        *,
+        options: Optional[Sequence[ExecutableOption]] = None,
+    ) -> list[ModelType]:
+        """
+        Get several records by ID within the current project in one query.
+
+        Use this instead of calling get_by_id in a loop. IDs that don't
+        exist (or belong to another project) are skipped, and result order
+        is not guaranteed to match ``ids``. Inputs longer than
+        MAX_IDS_PER_QUERY are fetched in chunks.
+
+        Args:
+            ids: UUIDs of the records
+            include_deleted: If True, include soft-deleted records (only if model supports it)
+            options: Loader options (e.g. ``selectinload``) applied to the query
+
+        Returns:
+            List of found model instances
+
+        Example:
+            ```python
+            rfqs = await repository.get_many_by_ids([rfq_id_1, rfq_id_2])
+            ```
+        """
+        query = _build_many_by_ids_stmt(
+            self.model,
+            self._has_soft_delete and not include_deleted,
+        )
+        if options:
+            query = query.options(*options)
+        unique_ids = list(dict.fromkeys(ids))
+
+        instances: list[ModelType] = []
+        for start in range(0, len(unique_ids), MAX_IDS_PER_QUERY):
+            result = await self.session.execute(
+                query,
+                {
+                    "ids": unique_ids[start:start + MAX_IDS_PER_QUERY],
+                    "project_id": self.project_id,
+                },
+            )
+            instances.extend(result.scalars().all())
+        return instances
+
     async def list(
         self,
         skip: int = 0,
         limit: int = 100,
         include_deleted: bool = False,
         order_by: Optional[Any] = None,
+        options: Optional[Sequence[ExecutableOption]] = None,
         **filters: Any,
     ) -> list[ModelType]:
         """
@@ -177,6 +395,8 @@ class BaseRepository(Generic[ModelType]):
             limit: Maximum number of records to return
             include_deleted: If True, include soft-deleted records (only if model supports it)
             order_by: Column(s) to order by (defaults to created_at DESC)
+            options: Loader options, e.g. ``[selectinload(RFQ.line_items)]``, so
+                relationships of all returned rows load in one extra query
             **filters: Additional filters to apply (e.g., status='active')
 
         Returns:
@@ -189,33 +409,100 @@ class BaseRepository(Generic[ModelType]):
 
             # Get with custom ordering
             rfqs = await repository.list(order_by=RFQ.created_at.desc())
+
+            # Eager-load a relationship instead of lazy-loading it per row
+            rfqs = await repository.list(options=[selectinload(RFQ.line_items)])
             ```
         """
-        query = select(self.model)
+        query, params = self._list_query(include_deleted, order_by, options, filters, paginate=True)
+        result = await self.session.execute(query, {**params, "skip": skip, "limit": limit})
+        return list(result.scalars().all())
 
-        # Enforce project filtering (mandatory)
-        query = self._enforce_project_filter(query)
+    async def stream(
+        self,
+        include_deleted: bool = False,
+        order_by: Optional[Any] = None,
+        options: Optional[Sequence[ExecutableOption]] = None,
+        chunk_size: int = 500,
+        **filters: Any,
+    ) -> AsyncIterator[ModelType]:
+        """
+        Iterate over all matching records within the current project.
 
-        # Apply additional filters
-        for key, value in filters.items():
-            if hasattr(self.model, key):
-                query = query.where(getattr(self.model, key) == value)
+        Same filtering and ordering as :meth:`list`, without pagination. Rows
+        come from a server-side cursor ``chunk_size`` at a time, so exports and
+        other large reads never hold the whole result in memory.
 
-        # Apply soft delete filter unless explicitly including deleted
+        Args:
+            include_deleted: If True, include soft-deleted records (only if model supports it)
+            order_by: Column(s) to order by (defaults to created_at DESC)
+            options: Loader options applied to the query
+            chunk_size: Number of rows fetched from the cursor per round trip
+            **filters: Additional filters to apply (e.g., status='active')
+
+        Yields:
+            Model instances
+
+        Example:
+            ```python
+            async for rfq in repository.stream(status='published'):
+                writer.writerow(...)
+            ```
+        """
+        query, params = self._list_query(include_deleted, order_by, options, filters, paginate=False)
+        result = await self.session.stream(
+            query,
+            params,
+            execution_options={"yield_per": chunk_size},
+        )
+        async for instance in result.scalars():
+            yield instance
+
+    async def list_core(
+        self,
+        *columns: Any,
+        skip: int = 0,
+        limit: int = 100,
+        include_deleted: bool = False,
+        **filters: Any,
+    ) -> Sequence[RowMapping]:
+        """
+        List records as plain row mappings, bypassing the ORM.
+
+        For read-only endpoints that only serialize rows: no ORM instances,
+        identity map or attribute instrumentation are involved. Filtering,
+        soft delete handling and default ordering match :meth:`list`.
+
+        Args:
+            *columns: Columns to select (defaults to all table columns)
+            skip: Number of records to skip (for pagination)
+            limit: Maximum number of records to return
+            include_deleted: If True, include soft-deleted records (only if model supports it)
+            **filters: Additional filters to apply (e.g., status='active')
+
+        Returns:
+            Sequence of read-only mappings keyed by column name
+
+        Example:
+            ```python
+            rows = await repository.list_core(RFQ.id, RFQ.title, status='published')
+            return [RFQSummary.model_validate(row) for row in rows]
+            ```
+        """
+        filter_shape, params = self._filter_params(filters)
+        query = _apply_filter_shape(
+            select(*(columns or self.model.__table__.columns)),
+            self.model,
+            filter_shape,
+        )
         if not include_deleted:
             query = self._apply_soft_delete_filter(query)
-
-        # Apply ordering
-        if order_by is not None:
-            query = query.order_by(order_by)
-        elif hasattr(self.model, "created_at"):
+        if "created_at" in _column_attributes(self.model):
             query = query.order_by(self.model.created_at.desc())
+        query = query.offset(bindparam("skip")).limit(bindparam("limit"))
 
-        # Apply pagination
-        query = query.offset(skip).limit(limit)
-
-        result = await self.session.execute(query)
-        return list(result.scalars().all())
+        result = await self.session.execute(query, {**params, "skip": skip, "limit": limit})
+        return result.mappings().all()
 
     async def create(self, **data: Any) -> ModelType:
         """
@@ -248,10 +535,46 @@ class BaseRepository(Generic[ModelType]):
         instance = self.model(**data)
         self.session.add(instance)
         await self.session.flush()
-        await self.session.refresh(instance)
+        await self._refresh_expired(instance)
 
         return instance
 
+    async def create_many(self, rows: Sequence[dict[str, Any]]) -> Sequence[ModelType]:
+        """
+        Create several records within the current project in one statement.
+
+        Uses an ORM bulk INSERT ... RETURNING, so N rows cost one round trip
+        (batched by SQLAlchemy's insertmanyvalues) instead of N flushes.
+        project_id is injected into every row and cannot be overridden.
+
+        Args:
+            rows: Model attributes for each record
+
+        Returns:
+            Created model instances, in the order of ``rows``
+
+        Raises:
+            ValueError: If any row sets a project_id different from the repository's
+
+        Example:
+            ```python
+            rfqs = await repository.create_many([
+                {"title": "First RFQ"},
+                {"title": "Second RFQ"},
+            ])
+            ```
+        """
+        if not rows:
+            return []
+
+        # Copy so callers' dicts are not mutated by project_id injection
+        values = [self._check_project_id(dict(row)) for row in rows]
+        result = await self.session.scalars(
+            insert(self.model).returning(self.model, sort_by_parameter_order=True),
+            values,
+        )
+        return result.all()
+
     async def update(
         self,
         id: uuid.UUID,
@@ -293,22 +616,20 @@ class BaseRepository(Generic[ModelType]):
         # Build update query with project enforcement
         query = (
             update(self.model)
-            .where(and_(self.model.id == id, self.model.project_id == self.project_id))
+            .where(self.model.id == id, self._project_filter)
             .values(**data)
             .returning(self.model)
+            # RETURNING overwrites any instance already in the identity map,
+            # so the session needs no evaluate/fetch synchronization pass.
+            .execution_options(synchronize_session=False, populate_existing=True)
         )
 
         # Apply soft delete filter to prevent updating deleted records
-        if self._has_soft_delete:
-            query = query.where(self.model.deleted_at.is_(None))
+        query = self._apply_soft_delete_filter(query)
 
         result = await self.session.execute(query)
-        instance = result.scalar_one_or_none()
-
-        if instance:
-            await self.session.refresh(instance)
-
-        return instance
+        # RETURNING already loaded every column onto the instance
+        return result.scalar_one_or_none()
 
     async def soft_delete(self, id: uuid.UUID) -> Optional[ModelType]:
         """
@@ -357,19 +678,16 @@ class BaseRepository(Generic[ModelType]):
             deleted = await repository.delete(rfq_id)
             ```
         """
-        query = select(self.model).where(
-            and_(self.model.id == id, self.model.project_id == self.project_id)
+        # Single DELETE ... RETURNING instead of SELECT then ORM delete.
+        # Relies on database-level ON DELETE rules rather than ORM cascades.
+        query = (
+            delete(self.model)
+            .where(self.model.id == id, self._project_filter)
+            .returning(self.model.id)
         )
 
         result = await self.session.execute(query)
-        instance = result.scalar_one_or_none()
-
-        if instance:
-            await self.session.delete(instance)
-            await self.session.flush()
-            return True
-
-        return False
+        return result.scalar_one_or_none() is not None
 
     async def count(self, include_deleted: bool = False, **filters: Any) -> int:
         """
@@ -387,23 +705,14 @@ class BaseRepository(Generic[ModelType]):
             total = await repository.count(status='published')
             ```
         """
-        from sqlalchemy import func
-
-        query = select(func.count()).select_from(self.model)
-
-        # Enforce project filtering
-        query = self._enforce_project_filter(query)
-
-        # Apply additional filters
-        for key, value in filters.items():
-            if hasattr(self.model, key):
-                query = query.where(getattr(self.model, key) == value)
-
-        # Apply soft delete filter
-        if not include_deleted:
-            query = self._apply_soft_delete_filter(query)
+        filter_shape, params = self._filter_params(filters)
+        query = _build_count_stmt(
+            self.model,
+            filter_shape,
+            self._has_soft_delete and not include_deleted,
+        )
 
-        result = await self.session.execute(query)
+        result = await self.session.execute(query, params)
         return result.scalar_one() or 0
 
     async def exists(self, id: uuid.UUID, include_deleted: bool = False) -> bool:
@@ -423,14 +732,15 @@ class BaseRepository(Generic[ModelType]):
                 # do something
             ```
         """
-        query = select(self.model.id).where(self.model.id == id)
+        condition = exists().where(self.model.id == id)
 
         # Enforce project filtering
-        query = self._enforce_project_filter(query)
+        condition = self._enforce_project_filter(condition)
 
         # Apply soft delete filter
         if not include_deleted:
-            query = self._apply_soft_delete_filter(query)
+            condition = self._apply_soft_delete_filter(condition)
 
-        result = await self.session.execute(query)
-        return result.scalar_one_or_none() is not None
+        # SELECT EXISTS (...) returns a single boolean and stops at the first match
+        result = await self.session.execute(select(condition))
+        return bool(result.scalar())
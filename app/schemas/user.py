@@ -1,11 +1,18 @@
 from datetime import datetime
+from typing import Annotated
 from uuid import UUID
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, StringConstraints
+
+# Shape check only (one "@", a dotted domain, no whitespace). EmailStr's full
+# email-validator parse is too costly to run on every request body.
+EMAIL_PATTERN = r"^[^@\s]+@[^@\s]+\.[^@\s]+$"
+
+Email = Annotated[str, StringConstraints(strip_whitespace=True, max_length=254, pattern=EMAIL_PATTERN)]
 
 
 class UserBase(BaseModel):
-    email: EmailStr
+    email: Email
     full_name: str | None = None
     is_active: bool = True
 
@@ -19,6 +26,5 @@ class UserRead(UserBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
@@ -1,10 +1,8 @@
-from typing import Sequence
-
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User
-from app.schemas.user import UserCreate
+from app.schemas.user import UserCreate, UserRead
 
 
 async def create_user(db: AsyncSession, user_in: UserCreate) -> User:
@@ -26,8 +24,10 @@ async def get_user(db: AsyncSession, user_id: str) -> User | None:
     return result.scalar_one_or_none()
 
 
-async def get_users(db: AsyncSession, skip: int = 0, limit: int = 100) -> Sequence[User]:
-    stmt = select(User).offset(skip).limit(limit)
+async def get_users(db: AsyncSession, skip: int = 0, limit: int = 100) -> list[UserRead]:
+    # Read-only listing: plain Core rows validated straight into UserRead
+    # skip ORM instance construction and identity-map bookkeeping.
+    stmt = select(*User.__table__.columns).offset(skip).limit(limit)
     result = await db.execute(stmt)
-    return result.scalars().all()
+    return [UserRead.model_validate(row) for row in result.mappings()]
 
@@ -0,0 +1,66 @@
+"""
+Tests for project-scoped model bases.
+
+Tests cover the project indexes and the project_id flush guard in
+app/models/base_project.py. No database is needed: indexes are checked on
+the table metadata and the guard runs before a connection is acquired.
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy.exc import UnboundExecutionError
+from sqlalchemy.orm import Session
+
+# Aliased so pytest doesn't try to collect the Test* model classes
+from tests.conftest import TestProjectModel as ProjectModel
+from tests.conftest import TestProjectModelWithSoftDelete as SoftDeleteModel
+
+
+def index_named(model: type, name: str):
+    """Return the index called ``name`` on ``model``'s table."""
+    return next(index for index in model.__table__.indexes if index.name == name)
+
+
+class TestProjectIndexes:
+    """Tests for the indexes declared by project_table_args."""
+
+    @pytest.mark.parametrize(
+        "model, name",
+        [
+            (ProjectModel, "ix_test_project_models_project"),
+            (SoftDeleteModel, "ix_test_project_models_soft_project"),
+            (SoftDeleteModel, "ix_test_project_models_soft_project_active"),
+        ],
+    )
+    def test_index_leads_with_project_id(self, model, name):
+        """Should declare each project index with project_id as its first column."""
+        index = index_named(model, name)
+
+        assert next(iter(index.columns)).name == "project_id"
+
+    def test_active_index_covers_only_live_rows(self):
+        """Should restrict the soft-delete index to rows where deleted_at IS NULL."""
+        index = index_named(SoftDeleteModel, "ix_test_project_models_soft_project_active")
+
+        assert str(index.dialect_options["postgresql"]["where"]) == "deleted_at IS NULL"
+
+
+class TestRequireProjectId:
+    """Tests for the before_flush project_id guard."""
+
+    def test_rejects_new_instance_without_project_id(self):
+        """Should raise ValueError before flushing a row with no project_id."""
+        session = Session()
+        session.add(ProjectModel(id=uuid.uuid4()))
+
+        with pytest.raises(ValueError, match="requires a project_id"):
+            session.flush()
+
+    def test_allows_new_instance_with_project_id(self):
+        """Should let the flush proceed (here: to the missing bind) when project_id is set."""
+        session = Session()
+        session.add(ProjectModel(id=uuid.uuid4(), project_id=uuid.uuid4()))
+
+        with pytest.raises(UnboundExecutionError):
+            session.flush()
@@ -0,0 +1,441 @@
+"""
+Tests for BaseRepository statement construction.
+
+Tests cover the cached list/count statements in app/repositories/base.py.
+Statements are compiled for PostgreSQL and inspected; no database needed.
+"""
+
+import uuid
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+
+from app.repositories.base import (
+    MAX_IDS_PER_QUERY,
+    BaseRepository,
+    _build_count_stmt,
+    _build_list_stmt,
+)
+
+# Aliased so pytest doesn't try to collect the Test* model classes
+from tests.conftest import TestProjectModel as ProjectModel
+from tests.conftest import TestProjectModelWithSoftDelete as SoftDeleteModel
+
+
+def make_repository(model: type) -> tuple[BaseRepository, AsyncMock]:
+    """Create a repository over a mock session; return it with the session."""
+    session = AsyncMock(spec=AsyncSession)
+    session.execute.return_value = MagicMock()
+    return BaseRepository(session, uuid.uuid4(), model), session
+
+
+def executed(session: AsyncMock) -> tuple[str, dict]:
+    """Return the SQL and parameters of the last statement executed on ``session``."""
+    statement, params = session.execute.call_args.args
+    return str(statement.compile(dialect=postgresql.dialect())), params
+
+
+class TestGetById:
+    """Tests for BaseRepository.get_by_id."""
+
+    @pytest.mark.asyncio
+    async def test_applies_loader_options(self):
+        """Should apply loader options to the query."""
+        repository, session = make_repository(ProjectModel)
+
+        await repository.get_by_id(uuid.uuid4(), options=[load_only(ProjectModel.id)])
+
+        statement = session.execute.call_args.args[0]
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        assert sql.startswith("SELECT test_project_models.id \nFROM")
+        assert "test_project_models.project_id = " in sql
+
+    @pytest.mark.asyncio
+    async def test_reuses_project_filter_clause(self):
+        """Should filter with the clause built once in __init__, bound to project_id."""
+        repository, session = make_repository(SoftDeleteModel)
+
+        await repository.get_by_id(uuid.uuid4())
+        await repository.exists(uuid.uuid4())
+
+        first, second = (call.args[0] for call in session.execute.call_args_list)
+        compiled = first.compile(dialect=postgresql.dialect())
+        assert repository._project_filter in first.whereclause.clauses
+        assert compiled.params["project_id"] == repository.project_id
+        assert "deleted_at IS NULL" in str(second.compile(dialect=postgresql.dialect()))
+
+
+class TestGetManyByIds:
+    """Tests for BaseRepository.get_many_by_ids."""
+
+    @pytest.mark.asyncio
+    async def test_fetches_all_ids_in_one_query(self):
+        """Should issue a single project-scoped IN query for all ids."""
+        repository, session = make_repository(SoftDeleteModel)
+        ids = [uuid.uuid4(), uuid.uuid4(), uuid.uuid4()]
+
+        await repository.get_many_by_ids(ids)
+
+        sql, params = executed(session)
+        session.execute.assert_awaited_once()
+        assert "test_project_models_soft.id IN (__[POSTCOMPILE_ids])" in sql
+        assert "deleted_at IS NULL" in sql
+        assert params == {"ids": ids, "project_id": repository.project_id}
+
+    @pytest.mark.asyncio
+    async def test_deduplicates_ids(self):
+        """Should bind each id once, keeping first-seen order."""
+        repository, session = make_repository(ProjectModel)
+        first, second = uuid.uuid4(), uuid.uuid4()
+
+        await repository.get_many_by_ids([first, second, first])
+
+        _, params = executed(session)
+        assert params["ids"] == [first, second]
+
+    @pytest.mark.asyncio
+    async def test_chunks_large_inputs(self):
+        """Should split inputs above MAX_IDS_PER_QUERY into several queries."""
+        repository, session = make_repository(ProjectModel)
+        session.execute.return_value.scalars.return_value.all.return_value = ["row"]
+        ids = [uuid.uuid4() for _ in range(MAX_IDS_PER_QUERY + 1)]
+
+        rows = await repository.get_many_by_ids(ids)
+
+        assert session.execute.await_count == 2
+        assert [len(call.args[1]["ids"]) for call in session.execute.call_args_list] == [
+            MAX_IDS_PER_QUERY,
+            1,
+        ]
+        assert rows == ["row", "row"]
+
+    @pytest.mark.asyncio
+    async def test_empty_input_skips_query(self):
+        """Should not query the database for an empty id list."""
+        repository, session = make_repository(ProjectModel)
+
+        assert await repository.get_many_by_ids([]) == []
+        session.execute.assert_not_called()
+
+
+class TestList:
+    """Tests for BaseRepository.list."""
+
+    @pytest.mark.asyncio
+    async def test_binds_project_filters_and_pagination(self):
+        """Should pass project_id, filter values and pagination as parameters."""
+        repository, session = make_repository(ProjectModel)
+
+        await repository.list(skip=10, limit=5, id=uuid.UUID(int=1))
+
+        sql, params = executed(session)
+        assert "test_project_models.project_id = %(project_id)s" in sql
+        assert "test_project_models.id = %(filter_id)s" in sql
+        assert params == {
+            "project_id": repository.project_id,
+            "filter_id": uuid.UUID(int=1),
+            "skip": 10,
+            "limit": 5,
+        }
+
+    @pytest.mark.asyncio
+    async def test_none_filter_compiles_to_is_null(self):
+        """Should filter None values with IS NULL instead of = NULL."""
+        repository, session = make_repository(SoftDeleteModel)
+
+        await repository.list(include_deleted=True, deleted_at=None)
+
+        sql, params = executed(session)
+        assert "test_project_models_soft.deleted_at IS NULL" in sql
+        assert "filter_deleted_at" not in params
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("key", ["not_a_column", "metadata", "__tablename__"])
+    async def test_rejects_unknown_filter_keys(self, key):
+        """Should raise instead of silently dropping filters that are not mapped columns."""
+        repository, session = make_repository(ProjectModel)
+
+        with pytest.raises(ValueError, match=f"Unknown filter: {key}"):
+            await repository.list(**{key: "x"})
+
+        session.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_excludes_soft_deleted_unless_requested(self):
+        """Should add deleted_at IS NULL only when include_deleted is False."""
+        repository, session = make_repository(SoftDeleteModel)
+
+        await repository.list()
+        active_sql, _ = executed(session)
+        await repository.list(include_deleted=True)
+        all_sql, _ = executed(session)
+
+        assert "deleted_at IS NULL" in active_sql
+        assert "deleted_at IS NULL" not in all_sql
+
+    @pytest.mark.asyncio
+    async def test_applies_custom_order_by(self):
+        """Should order by the given expression."""
+        repository, session = make_repository(ProjectModel)
+
+        await repository.list(order_by=ProjectModel.id.asc())
+
+        sql, _ = executed(session)
+        assert "ORDER BY test_project_models.id ASC" in sql
+
+    @pytest.mark.asyncio
+    async def test_applies_loader_options(self):
+        """Should apply loader options to the cached statement."""
+        repository, session = make_repository(ProjectModel)
+
+        await repository.list(options=[load_only(ProjectModel.id)])
+
+        sql, _ = executed(session)
+        assert sql.startswith("SELECT test_project_models.id \nFROM")
+
+    def test_reuses_statement_per_filter_shape(self):
+        """Should build the statement once per (model, filter shape, flags)."""
+        shape = (("id", False),)
+
+        first = _build_list_stmt(ProjectModel, shape, False, False)
+        second = _build_list_stmt(ProjectModel, shape, False, False)
+
+        assert first is second
+        assert _build_list_stmt(ProjectModel, (), False, False) is not first
+
+
+class TestStream:
+    """Tests for BaseRepository.stream."""
+
+    @pytest.mark.asyncio
+    async def test_yields_rows_from_server_side_cursor(self):
+        """Should stream the unpaginated list query with yield_per."""
+        repository, session = make_repository(SoftDeleteModel)
+        rows = ["first", "second"]
+
+        async def scalars():
+            for row in rows:
+                yield row
+
+        session.stream.return_value = MagicMock(scalars=scalars)
+
+        streamed = [row async for row in repository.stream(chunk_size=50, is_deleted=False)]
+
+        statement, params = session.stream.call_args.args
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        assert streamed == rows
+        assert session.stream.call_args.kwargs == {"execution_options": {"yield_per": 50}}
+        assert params == {"project_id": repository.project_id, "filter_is_deleted": False}
+        assert "deleted_at IS NULL" in sql
+        assert "LIMIT" not in sql and "OFFSET" not in sql
+
+
+class TestListCore:
+    """Tests for BaseRepository.list_core."""
+
+    @pytest.mark.asyncio
+    async def test_selects_columns_as_mappings(self):
+        """Should run a Core select of the given columns and return row mappings."""
+        repository, session = make_repository(SoftDeleteModel)
+        rows = [{"id": uuid.uuid4()}]
+        session.execute.return_value.mappings.return_value.all.return_value = rows
+
+        result = await repository.list_core(SoftDeleteModel.id, limit=10, is_deleted=False)
+
+        sql, params = executed(session)
+        assert result == rows
+        assert sql.startswith("SELECT test_project_models_soft.id \nFROM")
+        assert "deleted_at IS NULL" in sql
+        assert params == {
+            "project_id": repository.project_id,
+            "filter_is_deleted": False,
+            "skip": 0,
+            "limit": 10,
+        }
+
+    @pytest.mark.asyncio
+    async def test_defaults_to_all_table_columns(self):
+        """Should select every table column when none are given."""
+        repository, session = make_repository(ProjectModel)
+
+        await repository.list_core()
+
+        sql, _ = executed(session)
+        assert sql.startswith(
+            "SELECT test_project_models.id, test_project_models.project_id \nFROM"
+        )
+
+
+class TestCount:
+    """Tests for BaseRepository.count."""
+
+    @pytest.mark.asyncio
+    async def test_binds_project_and_filters(self):
+        """Should count within the project with filter values as parameters."""
+        repository, session = make_repository(SoftDeleteModel)
+        session.execute.return_value.scalar_one.return_value = 3
+
+        total = await repository.count(is_deleted=False)
+
+        sql, params = executed(session)
+        assert total == 3
+        assert "count(*)" in sql
+        assert "deleted_at IS NULL" in sql
+        assert params == {"project_id": repository.project_id, "filter_is_deleted": False}
+
+    def test_reuses_statement_per_filter_shape(self):
+        """Should build the count statement once per filter shape."""
+        assert _build_count_stmt(ProjectModel, (), False) is _build_count_stmt(
+            ProjectModel, (), False
+        )
+
+
+class TestExists:
+    """Tests for BaseRepository.exists."""
+
+    @pytest.mark.asyncio
+    async def test_selects_exists_within_project(self):
+        """Should issue a project-scoped SELECT EXISTS and return its boolean."""
+        repository, session = make_repository(SoftDeleteModel)
+        session.execute.return_value.scalar.return_value = True
+
+        found = await repository.exists(uuid.uuid4())
+
+        statement = session.execute.call_args.args[0]
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        assert found is True
+        assert sql.startswith("SELECT EXISTS")
+        assert "test_project_models_soft.project_id = " in sql
+        assert "deleted_at IS NULL" in sql
+
+    @pytest.mark.asyncio
+    async def test_include_deleted_skips_soft_delete_filter(self):
+        """Should not filter on deleted_at when include_deleted=True."""
+        repository, session = make_repository(SoftDeleteModel)
+        session.execute.return_value.scalar.return_value = False
+
+        found = await repository.exists(uuid.uuid4(), include_deleted=True)
+
+        statement = session.execute.call_args.args[0]
+        assert found is False
+        assert "deleted_at" not in str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestCreate:
+    """Tests for BaseRepository.create."""
+
+    @pytest.mark.asyncio
+    async def test_does_not_refresh_loaded_instance(self):
+        """Should skip the extra SELECT when flush left nothing expired."""
+        repository, session = make_repository(ProjectModel)
+
+        instance = await repository.create(id=uuid.uuid4())
+
+        session.add.assert_called_once_with(instance)
+        session.flush.assert_awaited_once()
+        session.refresh.assert_not_called()
+        assert instance.project_id == repository.project_id
+
+
+class TestCreateMany:
+    """Tests for BaseRepository.create_many."""
+
+    @pytest.mark.asyncio
+    async def test_inserts_all_rows_in_one_statement(self):
+        """Should issue one INSERT ... RETURNING with project_id injected in every row."""
+        repository, session = make_repository(ProjectModel)
+        created = [ProjectModel(), ProjectModel()]
+        session.scalars.return_value = MagicMock(all=MagicMock(return_value=created))
+        rows = [{"id": uuid.uuid4()}, {"id": uuid.uuid4()}]
+
+        result = await repository.create_many(rows)
+
+        statement, values = session.scalars.call_args.args
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        assert result == created
+        session.scalars.assert_awaited_once()
+        assert sql.startswith("INSERT INTO test_project_models")
+        assert "RETURNING" in sql
+        assert values == [
+            {"id": rows[0]["id"], "project_id": repository.project_id},
+            {"id": rows[1]["id"], "project_id": repository.project_id},
+        ]
+        assert "project_id" not in rows[0]
+
+    @pytest.mark.asyncio
+    async def test_rejects_foreign_project_id(self):
+        """Should refuse rows that set another project's id."""
+        repository, session = make_repository(ProjectModel)
+
+        with pytest.raises(ValueError):
+            await repository.create_many([{"project_id": uuid.uuid4()}])
+
+        session.scalars.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_empty_input_skips_query(self):
+        """Should not touch the database for no rows."""
+        repository, session = make_repository(ProjectModel)
+
+        assert await repository.create_many([]) == []
+        session.scalars.assert_not_called()
+
+
+class TestUpdate:
+    """Tests for BaseRepository.update."""
+
+    @pytest.mark.asyncio
+    async def test_returns_instance_without_refresh(self):
+        """Should return the RETURNING row without refreshing it."""
+        repository, session = make_repository(SoftDeleteModel)
+        updated = SoftDeleteModel(id=uuid.uuid4(), project_id=repository.project_id)
+        session.execute.return_value.scalar_one_or_none.return_value = updated
+
+        result = await repository.update(updated.id, is_deleted=True)
+
+        assert result is updated
+        session.refresh.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_populates_existing_from_returning(self):
+        """Should load RETURNING rows over identity-map instances without a sync pass."""
+        repository, session = make_repository(SoftDeleteModel)
+
+        await repository.update(uuid.uuid4(), is_deleted=True)
+
+        options = session.execute.call_args.args[0].get_execution_options()
+        assert options["synchronize_session"] is False
+        assert options["populate_existing"] is True
+
+
+class TestDelete:
+    """Tests for BaseRepository.delete."""
+
+    @pytest.mark.asyncio
+    async def test_deletes_with_single_returning_statement(self):
+        """Should issue one project-scoped DELETE ... RETURNING."""
+        repository, session = make_repository(ProjectModel)
+        record_id = uuid.uuid4()
+        session.execute.return_value.scalar_one_or_none.return_value = record_id
+
+        deleted = await repository.delete(record_id)
+
+        statement = session.execute.call_args.args[0]
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        assert deleted is True
+        session.execute.assert_awaited_once()
+        assert sql.startswith("DELETE FROM test_project_models")
+        assert "test_project_models.project_id = " in sql
+        assert "RETURNING test_project_models.id" in sql
+
+    @pytest.mark.asyncio
+    async def test_returns_false_when_not_found(self):
+        """Should return False when no row matched."""
+        repository, session = make_repository(ProjectModel)
+        session.execute.return_value.scalar_one_or_none.return_value = None
+
+        assert await repository.delete(uuid.uuid4()) is False
@@ -0,0 +1,44 @@
+"""
+Tests for UUID primary key generation.
+
+Tests cover uuid7 from app/models/base_uuid.py.
+"""
+
+import time
+import uuid
+
+from app.models.base_uuid import uuid7
+
+
+class TestUUID7:
+    """Tests for uuid7 function."""
+
+    def test_sets_version_and_variant(self):
+        """Should produce RFC 9562 version 7 UUIDs."""
+        value = uuid7()
+
+        assert isinstance(value, uuid.UUID)
+        assert value.version == 7
+        assert value.variant == uuid.RFC_4122
+
+    def test_embeds_current_unix_milliseconds(self):
+        """Should store the creation time in the leading 48 bits."""
+        before = time.time_ns() // 1_000_000
+        value = uuid7()
+        after = time.time_ns() // 1_000_000
+
+        assert before <= value.int >> 80 <= after
+
+    def test_orders_by_creation_time(self):
+        """Should sort UUIDs created in later milliseconds after earlier ones."""
+        first = uuid7()
+        time.sleep(0.002)
+        second = uuid7()
+
+        assert first < second
+
+    def test_generates_unique_values(self):
+        """Should not repeat within the same millisecond."""
+        values = {uuid7() for _ in range(1000)}
+
+        assert len(values) == 1000
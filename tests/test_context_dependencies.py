@@ -6,12 +6,23 @@ from app/deps/project.py.
 """
 
 import uuid
+from dataclasses import FrozenInstanceError
+from types import SimpleNamespace
+
 import pytest
-from unittest.mock import MagicMock, patch
-from fastapi import HTTPException, Request
+from unittest.mock import patch
+from fastapi import HTTPException
 
 from app.deps.project import ProjectContext, get_project_context, get_project_id
 
+_MISSING = object()
+
+
+def fake_request(context=_MISSING, path_params=None) -> SimpleNamespace:
+    """Build a stand-in Request exposing only .state and .path_params."""
+    state = SimpleNamespace() if context is _MISSING else SimpleNamespace(project_context=context)
+    return SimpleNamespace(state=state, path_params=path_params or {})
+
 
 class TestProjectContext:
     """Tests for ProjectContext dataclass."""
@@ -41,6 +52,13 @@ class TestProjectContext:
         assert context.user_id == user_id
         assert context.organization_id == organization_id
 
+    def test_is_immutable(self):
+        """Should reject attribute assignment after creation."""
+        context = ProjectContext(project_id=uuid.uuid4())
+
+        with pytest.raises(FrozenInstanceError):
+            context.project_id = uuid.uuid4()
+
     def test_raises_value_error_on_none_project_id(self):
         """Should raise ValueError when project_id is None."""
         with pytest.raises(ValueError, match="project_id cannot be None"):
@@ -56,8 +74,7 @@ class TestGetProjectContext:
         project_id = uuid.uuid4()
         context = ProjectContext(project_id=project_id)
         
-        request = MagicMock(spec=Request)
-        request.state.project_context = context
+        request = fake_request(context)
         
         result = await get_project_context(request)
         
@@ -67,24 +84,47 @@ class TestGetProjectContext:
     @pytest.mark.asyncio
     async def test_raises_400_when_project_context_missing(self):
         """Should raise HTTPException 400 when project_context not in request.state."""
-        request = MagicMock(spec=Request)
-        # Create a state object without project_context attribute
-        request.state = MagicMock()
-        # Make hasattr return False for project_context
-        type(request.state).project_context = None
-        # Override hasattr to return False
-        with patch("builtins.hasattr", return_value=False):
-            with pytest.raises(HTTPException) as exc_info:
-                await get_project_context(request)
+        request = fake_request()
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_project_context(request)
         
         assert exc_info.value.status_code == 400
         assert "Project ID is required" in exc_info.value.detail
 
+    @pytest.mark.asyncio
+    async def test_falls_back_to_path_parameter(self):
+        """Should build the context from a project_id path parameter when state has none."""
+        project_id = uuid.uuid4()
+        request = fake_request(path_params={"project_id": str(project_id)})
+
+        result = await get_project_context(request)
+
+        assert result == ProjectContext(project_id=project_id)
+
+    @pytest.mark.asyncio
+    async def test_prefers_state_over_path_parameter(self):
+        """Should use the middleware-provided context over a path parameter."""
+        context = ProjectContext(project_id=uuid.uuid4())
+        request = fake_request(context, path_params={"project_id": str(uuid.uuid4())})
+
+        assert await get_project_context(request) is context
+
+    @pytest.mark.asyncio
+    async def test_raises_400_on_invalid_path_parameter(self):
+        """Should raise HTTPException 400 for an invalid project_id path parameter."""
+        request = fake_request(path_params={"project_id": "invalid-uuid"})
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_project_context(request)
+
+        assert exc_info.value.status_code == 400
+        assert "Invalid project ID format in path" in exc_info.value.detail
+
     @pytest.mark.asyncio
     async def test_raises_500_when_project_context_not_instance(self):
         """Should raise HTTPException 500 when project_context is not ProjectContext instance."""
-        request = MagicMock(spec=Request)
-        request.state.project_context = {"project_id": str(uuid.uuid4())}  # Dict instead
+        request = fake_request({"project_id": str(uuid.uuid4())})  # Dict instead
         
         with pytest.raises(HTTPException) as exc_info:
             await get_project_context(request)
@@ -95,14 +135,13 @@ class TestGetProjectContext:
     @pytest.mark.asyncio
     async def test_raises_400_when_project_id_is_none(self):
         """Should raise HTTPException 400 when project_id is None."""
-        # Create a context with None project_id (bypassing __post_init__)
+        # Create a context with None project_id (bypassing __post_init__ and frozen)
         context = ProjectContext.__new__(ProjectContext)
-        context.project_id = None
-        context.user_id = None
-        context.organization_id = None
+        object.__setattr__(context, "project_id", None)
+        object.__setattr__(context, "user_id", None)
+        object.__setattr__(context, "organization_id", None)
         
-        request = MagicMock(spec=Request)
-        request.state.project_context = context
+        request = fake_request(context)
         
         with pytest.raises(HTTPException) as exc_info:
             await get_project_context(request)
@@ -113,21 +152,18 @@ class TestGetProjectContext:
     @pytest.mark.asyncio
     async def test_raises_500_on_unexpected_error(self):
         """Should raise HTTPException 500 on unexpected errors."""
-        request = MagicMock(spec=Request)
-        # Make accessing request.state raise an exception
-        request.state = MagicMock()
-        # Make hasattr raise an exception
-        def mock_hasattr(obj, name):
-            if name == "project_context":
-                raise RuntimeError("Unexpected error accessing state")
-            return False
-        
-        with patch("builtins.hasattr", side_effect=mock_hasattr):
-            with pytest.raises(HTTPException) as exc_info:
-                await get_project_context(request)
-            
-            assert exc_info.value.status_code == 500
-            assert "Failed to extract project context" in exc_info.value.detail
+        class BrokenState:
+            # hasattr() only swallows AttributeError, so this propagates
+            def __getattr__(self, name):
+                raise LookupError("Unexpected error accessing state")
+
+        request = SimpleNamespace(state=BrokenState(), path_params={})
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_project_context(request)
+
+        assert exc_info.value.status_code == 500
+        assert "Failed to extract project context" in exc_info.value.detail
 
 
 class TestGetProjectId:
@@ -139,8 +175,7 @@ class TestGetProjectId:
         project_id = uuid.uuid4()
         context = ProjectContext(project_id=project_id)
         
-        request = MagicMock(spec=Request)
-        request.state.project_context = context
+        request = fake_request(context)
         
         with patch("app.deps.project.get_project_context", return_value=context):
             result = await get_project_id(request)
@@ -150,7 +185,7 @@ class TestGetProjectId:
     @pytest.mark.asyncio
     async def test_propagates_http_exception_from_get_project_context(self):
         """Should propagate HTTPException from get_project_context."""
-        request = MagicMock(spec=Request)
+        request = fake_request()
         http_exception = HTTPException(status_code=500, detail="Context error")
         
         with patch("app.deps.project.get_project_context", side_effect=http_exception):
@@ -5,185 +5,181 @@ Tests cover the new error handling, transaction management, and session lifecycl
 introduced in app/deps/db.py.
 """
 
+import asyncio
+from types import SimpleNamespace
+
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import MagicMock
 from fastapi import HTTPException
 
 from sqlalchemy.exc import SQLAlchemyError, OperationalError
-from sqlalchemy.ext.asyncio import AsyncSession
 
+import app.deps.db as db_module
 from app.deps.db import get_db_session, _get_db_session_context
 
 
+class CountingAsyncMock:
+    """Awaitable stand-in that only counts calls (no mock_calls bookkeeping)."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.side_effect: BaseException | None = None
+
+    async def __call__(self, *args, **kwargs) -> None:
+        self.calls += 1
+        if self.side_effect is not None:
+            raise self.side_effect
+
+    def assert_called_once(self) -> None:
+        assert self.calls == 1, f"expected 1 call, got {self.calls}"
+
+    def assert_not_called(self) -> None:
+        assert self.calls == 0, f"expected no calls, got {self.calls}"
+
+
+@pytest.fixture
+def mock_session() -> SimpleNamespace:
+    """Session stand-in: these tests only touch commit/rollback/close."""
+    return SimpleNamespace(
+        commit=CountingAsyncMock(),
+        rollback=CountingAsyncMock(),
+        close=CountingAsyncMock(),
+    )
+
+
+@pytest.fixture
+def session_local(monkeypatch, mock_session) -> MagicMock:
+    """Session factory mock installed as get_sessionmaker(); its context yields mock_session."""
+    session_local = MagicMock()
+    session_local.return_value.__aenter__.return_value = mock_session
+    session_local.return_value.__aexit__.return_value = None
+    monkeypatch.setattr(db_module, "get_sessionmaker", lambda: session_local)
+    return session_local
+
+
 class TestGetDbSessionContext:
     """Tests for _get_db_session_context context manager."""
 
     @pytest.mark.asyncio
-    async def test_successful_session_commit(self):
+    async def test_successful_session_commit(self, mock_session, session_local):
         """Should commit session when no exceptions occur."""
-        mock_session = AsyncMock(spec=AsyncSession)
-        mock_session.commit = AsyncMock()
-        mock_session.close = AsyncMock()
+        async with _get_db_session_context() as session:
+            assert session is mock_session
         
-        with patch("app.deps.db.AsyncSessionLocal") as mock_session_local:
-            mock_session_local.return_value.__aenter__.return_value = mock_session
-            mock_session_local.return_value.__aexit__.return_value = None
-            
-            async with _get_db_session_context() as session:
-                assert session == mock_session
-            
-            # Verify commit was called
-            mock_session.commit.assert_called_once()
-            # Verify close was called
-            mock_session.close.assert_called_once()
+        # Verify commit was called
+        mock_session.commit.assert_called_once()
+        # Session is closed by the session factory's context manager
+        session_local.return_value.__aexit__.assert_called_once()
+        mock_session.close.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_sqlalchemy_error_rollback_and_raise_http_exception(self):
+    async def test_sqlalchemy_error_rollback_and_raise_http_exception(self, mock_session, session_local):
         """Should rollback and raise HTTPException on SQLAlchemyError."""
-        mock_session = AsyncMock(spec=AsyncSession)
-        mock_session.rollback = AsyncMock()
-        mock_session.close = AsyncMock()
-        
         db_error = OperationalError("Connection failed", None, None)
         
-        with patch("app.deps.db.AsyncSessionLocal") as mock_session_local:
-            mock_session_local.return_value.__aenter__.side_effect = db_error
-            
-            with pytest.raises(HTTPException) as exc_info:
-                async with _get_db_session_context() as session:
-                    pass
-            
-            assert exc_info.value.status_code == 500
-            assert "Database operation failed" in exc_info.value.detail
-            mock_session.rollback.assert_not_called()  # Session not created yet
-
-    @pytest.mark.asyncio
-    async def test_sqlalchemy_error_during_execution_rollback(self):
-        """Should rollback session when SQLAlchemyError occurs during execution."""
-        mock_session = AsyncMock(spec=AsyncSession)
-        mock_session.commit = AsyncMock(side_effect=SQLAlchemyError("DB error"))
-        mock_session.rollback = AsyncMock()
-        mock_session.close = AsyncMock()
+        session_local.return_value.__aenter__.side_effect = db_error
         
-        with patch("app.deps.db.AsyncSessionLocal") as mock_session_local:
-            mock_session_local.return_value.__aenter__.return_value = mock_session
-            mock_session_local.return_value.__aexit__.return_value = None
-            
-            with pytest.raises(HTTPException) as exc_info:
-                async with _get_db_session_context() as session:
-                    pass
-            
-            assert exc_info.value.status_code == 500
-            assert "Database operation failed" in exc_info.value.detail
-            mock_session.rollback.assert_called_once()
-            mock_session.close.assert_called_once()
+        with pytest.raises(HTTPException) as exc_info:
+            async with _get_db_session_context() as session:
+                pass
+        
+        assert exc_info.value.status_code == 500
+        assert "Database operation failed" in exc_info.value.detail
+        mock_session.rollback.assert_not_called()  # Session not created yet
 
     @pytest.mark.asyncio
-    async def test_unexpected_exception_rollback_and_raise_http_exception(self):
-        """Should rollback and raise HTTPException on unexpected exceptions."""
-        mock_session = AsyncMock(spec=AsyncSession)
-        mock_session.commit = AsyncMock(side_effect=ValueError("Unexpected error"))
-        mock_session.rollback = AsyncMock()
-        mock_session.close = AsyncMock()
+    async def test_session_always_closed_on_error(self, mock_session, session_local):
+        """Should always close session even if exception occurs."""
+        mock_session.commit.side_effect = ValueError("Test error")
+
+        with pytest.raises(HTTPException):
+            async with _get_db_session_context() as session:
+                pass
         
-        with patch("app.deps.db.AsyncSessionLocal") as mock_session_local:
-            mock_session_local.return_value.__aenter__.return_value = mock_session
-            mock_session_local.return_value.__aexit__.return_value = None
-            
-            with pytest.raises(HTTPException) as exc_info:
-                async with _get_db_session_context() as session:
-                    pass
-            
-            assert exc_info.value.status_code == 500
-            assert "unexpected error occurred" in exc_info.value.detail.lower()
-            mock_session.rollback.assert_called_once()
-            mock_session.close.assert_called_once()
+        # Verify the session context manager was exited (closes the session)
+        session_local.return_value.__aexit__.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_session_close_error_logged_but_not_raised(self):
-        """Should log warning but not raise when closing session fails."""
-        mock_session = AsyncMock(spec=AsyncSession)
-        mock_session.commit = AsyncMock()
-        mock_session.close = AsyncMock(side_effect=Exception("Close error"))
+    async def test_endpoint_http_exception_rollback_and_propagate(self, mock_session, session_local):
+        """Should rollback and re-raise HTTPExceptions from the endpoint unchanged."""
+        with pytest.raises(HTTPException) as exc_info:
+            async with _get_db_session_context() as session:
+                raise HTTPException(status_code=404, detail="Not found")
         
-        with patch("app.deps.db.AsyncSessionLocal") as mock_session_local:
-            with patch("app.deps.db.logger") as mock_logger:
-                mock_session_local.return_value.__aenter__.return_value = mock_session
-                mock_session_local.return_value.__aexit__.return_value = None
-                
-                async with _get_db_session_context() as session:
-                    pass
-                
-                # Should log warning but not raise
-                mock_logger.warning.assert_called_once()
-                assert "Error closing session" in str(mock_logger.warning.call_args)
+        assert exc_info.value.status_code == 404
+        mock_session.commit.assert_not_called()
+        mock_session.rollback.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_session_always_closed_in_finally(self):
-        """Should always close session even if exception occurs."""
-        mock_session = AsyncMock(spec=AsyncSession)
-        mock_session.commit = AsyncMock(side_effect=Exception("Test error"))
-        mock_session.rollback = AsyncMock()
-        mock_session.close = AsyncMock()
+    @pytest.mark.parametrize(
+        "error",
+        [ValueError("bad input"), KeyError("missing"), SQLAlchemyError("query failed")],
+        ids=["value-error", "key-error", "sqlalchemy-error"],
+    )
+    async def test_endpoint_error_rollback_and_propagate(self, mock_session, session_local, error):
+        """Should rollback and re-raise endpoint errors untranslated (no generic 500)."""
+        with pytest.raises(type(error)) as exc_info:
+            async with _get_db_session_context() as session:
+                raise error
         
-        with patch("app.deps.db.AsyncSessionLocal") as mock_session_local:
-            mock_session_local.return_value.__aenter__.return_value = mock_session
-            mock_session_local.return_value.__aexit__.return_value = None
-            
-            with pytest.raises(HTTPException):
-                async with _get_db_session_context() as session:
-                    pass
-            
-            # Verify close was called in finally block
-            mock_session.close.assert_called_once()
+        assert exc_info.value is error
+        mock_session.commit.assert_not_called()
+        mock_session.rollback.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_cancellation_rollback_and_reraise(self):
-        """Should rollback and re-raise on BaseException (e.g. CancelledError)."""
-        import asyncio
-        mock_session = AsyncMock(spec=AsyncSession)
-        mock_session.commit = AsyncMock()
-        mock_session.rollback = AsyncMock()
-        mock_session.close = AsyncMock()
-        mock_session.commit.side_effect = asyncio.CancelledError()
-        with patch("app.deps.db.AsyncSessionLocal") as mock_session_local:
-            mock_session_local.return_value.__aenter__.return_value = mock_session
-            mock_session_local.return_value.__aexit__.return_value = None
-            with pytest.raises(asyncio.CancelledError):
-                async with _get_db_session_context() as session:
-                    pass
-            mock_session.rollback.assert_called_once()
-            mock_session.close.assert_called_once()
+    @pytest.mark.parametrize(
+        "error, expected_exception, detail",
+        [
+            (SQLAlchemyError("DB error"), HTTPException, "database operation failed"),
+            (ValueError("Unexpected error"), HTTPException, "unexpected error occurred"),
+            # BaseException (client cancellation) is re-raised untranslated
+            (asyncio.CancelledError(), asyncio.CancelledError, None),
+        ],
+        ids=["sqlalchemy-error", "unexpected-error", "cancelled"],
+    )
+    async def test_commit_failure_rolls_back(
+        self, mock_session, session_local, error, expected_exception, detail
+    ):
+        """Should rollback, exit the session context and raise the mapped exception."""
+        mock_session.commit.side_effect = error
+
+        with pytest.raises(expected_exception) as exc_info:
+            async with _get_db_session_context() as session:
+                pass
+
+        if detail is not None:
+            assert exc_info.value.status_code == 500
+            assert detail in exc_info.value.detail.lower()
+        mock_session.rollback.assert_called_once()
+        session_local.return_value.__aexit__.assert_called_once()
 
 
 class TestGetDbSession:
     """Tests for get_db_session FastAPI dependency."""
 
     @pytest.mark.asyncio
-    async def test_yields_session_from_context_manager(self):
+    async def test_yields_session_from_context_manager(self, mock_session, monkeypatch):
         """Should yield session from context manager."""
-        mock_session = AsyncMock(spec=AsyncSession)
-        mock_session.commit = AsyncMock()
-        mock_session.close = AsyncMock()
-        
-        with patch("app.deps.db._get_db_session_context") as mock_context:
-            mock_context.return_value.__aenter__.return_value = mock_session
-            mock_context.return_value.__aexit__.return_value = None
-            
-            async for session in get_db_session():
-                assert session == mock_session
-                break  # Only test first iteration
+        mock_context = MagicMock()
+        mock_context.return_value.__aenter__.return_value = mock_session
+        mock_context.return_value.__aexit__.return_value = None
+        monkeypatch.setattr(db_module, "_get_db_session_context", mock_context)
+
+        sessions = get_db_session()
+        session = await anext(sessions)
+        assert session is mock_session
+        await sessions.aclose()
 
     @pytest.mark.asyncio
-    async def test_propagates_http_exception_from_context(self):
+    async def test_propagates_http_exception_from_context(self, monkeypatch):
         """Should propagate HTTPException from context manager."""
         http_exception = HTTPException(status_code=500, detail="DB error")
         
-        with patch("app.deps.db._get_db_session_context") as mock_context:
-            mock_context.return_value.__aenter__.side_effect = http_exception
-            
-            with pytest.raises(HTTPException) as exc_info:
-                async for session in get_db_session():
-                    pass
-            
-            assert exc_info.value.status_code == 500
+        mock_context = MagicMock()
+        mock_context.return_value.__aenter__.side_effect = http_exception
+        monkeypatch.setattr(db_module, "_get_db_session_context", mock_context)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await anext(get_db_session())
+
+        assert exc_info.value.status_code == 500
@@ -0,0 +1,35 @@
+"""
+Tests for health check endpoints.
+
+Tests cover the liveness endpoint in app/api/v1/routes_example.py.
+"""
+
+from httpx import AsyncClient
+
+from app.deps.db import get_db_session
+from app.main import app
+
+
+class TestHealthCheck:
+    """Tests for the /health liveness endpoint."""
+
+    async def test_returns_ok(self, client: AsyncClient):
+        """Should report status ok."""
+        response = await client.get("/api/v1/health")
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "ok"}
+
+    async def test_does_not_open_db_session(self, client: AsyncClient):
+        """Should not depend on a database session."""
+        async def fail_get_db_session():
+            raise AssertionError("health check must not open a DB session")
+            yield  # pragma: no cover
+
+        app.dependency_overrides[get_db_session] = fail_get_db_session
+        try:
+            response = await client.get("/api/v1/health")
+        finally:
+            app.dependency_overrides.pop(get_db_session, None)
+
+        assert response.status_code == 200
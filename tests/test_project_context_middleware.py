@@ -5,12 +5,12 @@ Tests cover ProjectContextMiddleware and create_project_context_middleware
 from app/middleware/project_context.py.
 """
 
+import json
 import uuid
-import pytest
-from unittest.mock import AsyncMock, MagicMock
+from urllib.parse import urlencode
 
-from fastapi import Request, HTTPException
-from starlette.responses import Response
+import pytest
+from unittest.mock import AsyncMock
 
 from app.middleware.project_context import (
     ProjectContextMiddleware,
@@ -18,368 +18,515 @@ from app.middleware.project_context import (
 )
 from app.deps.project import ProjectContext
 
+# Fixed ids: the tests never rely on randomness, and failures reproduce exactly
+PROJECT_ID = uuid.UUID("00000000-0000-4000-8000-000000000001")
+OTHER_PROJECT_ID = uuid.UUID("00000000-0000-4000-8000-000000000002")
+
+
+def make_scope(
+    headers: dict[str, str] | None = None,
+    query: dict[str, str] | None = None,
+    path_params: dict[str, str] | None = None,
+    method: str = "GET",
+    path: str = "/items",
+) -> dict:
+    """Build a minimal ASGI HTTP scope."""
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "headers": [
+            (name.lower().encode("latin-1"), value.encode("latin-1"))
+            for name, value in (headers or {}).items()
+        ],
+        "query_string": urlencode(query or {}).encode("latin-1"),
+        "state": {},
+    }
+    if path_params is not None:
+        scope["path_params"] = path_params
+    return scope
+
+
+async def receive() -> dict:
+    """ASGI receive callable yielding an empty request body."""
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def discard(message: dict) -> None:
+    """ASGI send callable that drops every message."""
+
+
+async def unreachable_app(scope, receive, send) -> None:
+    """ASGI app for middleware expected to answer on its own."""
+    raise AssertionError("request should not reach the app")
+
+
+@pytest.fixture(scope="module")
+def middleware() -> ProjectContextMiddleware:
+    """Shared middleware instance for tests where the request is rejected."""
+    return ProjectContextMiddleware(app=unreachable_app)
+
+
+async def run_middleware(middleware_class: type, scope: dict) -> AsyncMock:
+    """Run the middleware around a mock app and return the mock app."""
+    app = AsyncMock()
+    middleware = middleware_class(app=app)
+    await middleware(scope, receive, discard)
+    return app
+
+
+async def get_error_response(middleware, scope: dict) -> tuple[int, dict]:
+    """Run a middleware instance that should answer directly; return (status, JSON body)."""
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    await middleware(scope, receive, send)
+
+    start, body = messages
+    assert start["type"] == "http.response.start"
+    return start["status"], json.loads(body["body"])
+
 
 class TestProjectContextMiddleware:
     """Tests for ProjectContextMiddleware."""
 
     @pytest.mark.asyncio
-    async def test_extracts_project_id_from_header(self):
-        """Should extract project_id from X-Project-ID header."""
-        project_id = uuid.uuid4()
-        
-        request = MagicMock(spec=Request)
-        request.headers = {"X-Project-ID": str(project_id)}
-        request.query_params = MagicMock()
-        request.query_params.get = MagicMock(return_value=None)
-        request.path_params = {}
-        
-        # Create a real state object
-        from types import SimpleNamespace
-        request.state = SimpleNamespace()
-        
-        call_next = AsyncMock(return_value=Response())
-        
-        middleware = ProjectContextMiddleware(app=MagicMock())
-        response = await middleware.dispatch(request, call_next)
-        
-        assert hasattr(request.state, "project_context")
-        assert isinstance(request.state.project_context, ProjectContext)
-        assert request.state.project_context.project_id == project_id
-        call_next.assert_called_once()
+    @pytest.mark.parametrize(
+        "scope_kwargs",
+        [
+            {"headers": {"X-Project-ID": str(PROJECT_ID)}},
+            {"query": {"project_id": str(PROJECT_ID)}},
+        ],
+        ids=["header", "query"],
+    )
+    async def test_extracts_project_id(self, scope_kwargs):
+        """Should extract project_id from the X-Project-ID header or the query string."""
+        scope = make_scope(**scope_kwargs)
+
+        app = await run_middleware(ProjectContextMiddleware, scope)
+
+        assert isinstance(scope["state"]["project_context"], ProjectContext)
+        assert scope["state"]["project_context"].project_id == PROJECT_ID
+        app.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_extracts_project_id_from_query_parameter(self):
-        """Should extract project_id from query parameter when header missing."""
-        project_id = uuid.uuid4()
-        
-        request = MagicMock(spec=Request)
-        request.headers = {}
-        request.query_params = MagicMock()
-        request.query_params.get = MagicMock(return_value=str(project_id))
-        request.path_params = {}
-        
-        from types import SimpleNamespace
-        request.state = SimpleNamespace()
-        
-        call_next = AsyncMock(return_value=Response())
-        
-        middleware = ProjectContextMiddleware(app=MagicMock())
-        response = await middleware.dispatch(request, call_next)
-        
-        assert request.state.project_context.project_id == project_id
-        call_next.assert_called_once()
+    async def test_finds_project_id_among_other_query_parameters(self):
+        """Should match project_id exactly, ignoring similarly named parameters."""
+        project_id = PROJECT_ID
+        scope = make_scope(
+            query={
+                "sub_project_id": str(OTHER_PROJECT_ID),
+                "page": "2",
+                "project_id": str(project_id),
+            }
+        )
+
+        await run_middleware(ProjectContextMiddleware, scope)
+
+        assert scope["state"]["project_context"].project_id == project_id
 
     @pytest.mark.asyncio
-    async def test_extracts_project_id_from_path_parameter(self):
-        """Should extract project_id from path parameter when header and query missing."""
-        project_id = uuid.uuid4()
-        
-        request = MagicMock(spec=Request)
-        request.headers = {}
-        request.query_params = MagicMock()
-        request.query_params.get = MagicMock(return_value=None)
-        request.path_params = {"project_id": str(project_id)}
-        
-        from types import SimpleNamespace
-        request.state = SimpleNamespace()
-        
-        call_next = AsyncMock(return_value=Response())
-        
-        middleware = ProjectContextMiddleware(app=MagicMock())
-        response = await middleware.dispatch(request, call_next)
-        
-        assert request.state.project_context.project_id == project_id
-        call_next.assert_called_once()
+    async def test_ignores_path_params(self):
+        """Should leave path parameters to get_project_context (they exist only after routing)."""
+        scope = make_scope(path_params={"project_id": str(OTHER_PROJECT_ID)})
+
+        app = await run_middleware(ProjectContextMiddleware, scope)
+
+        assert "project_context" not in scope["state"]
+        app.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_prefers_header_over_query_and_path(self):
-        """Should prefer header over query parameter and path parameter."""
-        header_id = uuid.uuid4()
-        query_id = uuid.uuid4()
-        path_id = uuid.uuid4()
-        
-        request = MagicMock(spec=Request)
-        request.headers = {"X-Project-ID": str(header_id)}
-        request.query_params = MagicMock()
-        request.query_params.get = MagicMock(return_value=str(query_id))
-        request.path_params = {"project_id": str(path_id)}
-        
-        from types import SimpleNamespace
-        request.state = SimpleNamespace()
-        
-        call_next = AsyncMock(return_value=Response())
-        
-        middleware = ProjectContextMiddleware(app=MagicMock())
-        response = await middleware.dispatch(request, call_next)
-        
-        assert request.state.project_context.project_id == header_id
+    async def test_extracts_project_id_after_configured_path_prefix(self):
+        """Should read the path segment after a configured project path prefix."""
+        app = AsyncMock()
+        middleware = ProjectContextMiddleware(app=app, project_path_prefixes=("/api/v1/projects/",))
+        scope = make_scope(path=f"/api/v1/projects/{PROJECT_ID}/rfqs")
+
+        await middleware(scope, receive, discard)
+
+        assert scope["state"]["project_context"].project_id == PROJECT_ID
+        app.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_prefers_query_over_path(self):
-        """Should prefer query parameter over path parameter."""
-        query_id = uuid.uuid4()
-        path_id = uuid.uuid4()
-        
-        request = MagicMock(spec=Request)
-        request.headers = {}
-        request.query_params = MagicMock()
-        request.query_params.get = MagicMock(return_value=str(query_id))
-        request.path_params = {"project_id": str(path_id)}
-        
-        from types import SimpleNamespace
-        request.state = SimpleNamespace()
-        
-        call_next = AsyncMock(return_value=Response())
-        
-        middleware = ProjectContextMiddleware(app=MagicMock())
-        response = await middleware.dispatch(request, call_next)
-        
-        assert request.state.project_context.project_id == query_id
+    async def test_prefers_header_over_path_prefix(self):
+        """Should only fall back to the path when header and query are absent."""
+        middleware = ProjectContextMiddleware(app=AsyncMock(), project_path_prefixes=("/projects/",))
+        scope = make_scope(
+            headers={"X-Project-ID": str(PROJECT_ID)},
+            path=f"/projects/{OTHER_PROJECT_ID}",
+        )
+
+        await middleware(scope, receive, discard)
+
+        assert scope["state"]["project_context"].project_id == PROJECT_ID
 
     @pytest.mark.asyncio
-    async def test_raises_400_on_invalid_uuid_in_header(self):
-        """Should raise HTTPException 400 for invalid UUID in header."""
-        request = MagicMock(spec=Request)
-        request.headers = {"X-Project-ID": "invalid-uuid"}
-        request.query_params = MagicMock()
-        request.query_params.get = MagicMock(return_value=None)
-        request.path_params = {}
-        
-        call_next = AsyncMock()
-        
-        middleware = ProjectContextMiddleware(app=MagicMock())
-        
-        with pytest.raises(HTTPException) as exc_info:
-            await middleware.dispatch(request, call_next)
-        
-        assert exc_info.value.status_code == 400
-        assert "Invalid project ID format in header" in exc_info.value.detail
-        call_next.assert_not_called()
+    async def test_responds_400_on_invalid_uuid_in_path(self):
+        """Should respond 400 for an invalid project ID after a project path prefix."""
+        middleware = ProjectContextMiddleware(app=unreachable_app, project_path_prefixes=("/projects/",))
+
+        status, body = await get_error_response(middleware, make_scope(path="/projects/invalid-uuid/rfqs"))
+
+        assert status == 400
+        assert "Invalid project ID format in path" in body["detail"]
 
     @pytest.mark.asyncio
-    async def test_raises_400_on_invalid_uuid_in_query(self):
-        """Should raise HTTPException 400 for invalid UUID in query."""
-        request = MagicMock(spec=Request)
-        request.headers = {}
-        request.query_params = MagicMock()
-        request.query_params.get = MagicMock(return_value="invalid-uuid")
-        request.path_params = {}
-        
-        call_next = AsyncMock()
-        
-        middleware = ProjectContextMiddleware(app=MagicMock())
-        
-        with pytest.raises(HTTPException) as exc_info:
-            await middleware.dispatch(request, call_next)
-        
-        assert exc_info.value.status_code == 400
-        assert "Invalid project ID format in query" in exc_info.value.detail
+    async def test_prefers_header_over_query(self):
+        """Should prefer header over query parameter."""
+        header_id = PROJECT_ID
+        query_id = OTHER_PROJECT_ID
+        scope = make_scope(
+            headers={"X-Project-ID": str(header_id)},
+            query={"project_id": str(query_id)},
+        )
+
+        await run_middleware(ProjectContextMiddleware, scope)
+
+        assert scope["state"]["project_context"].project_id == header_id
 
     @pytest.mark.asyncio
-    async def test_raises_400_on_invalid_uuid_in_path(self):
-        """Should raise HTTPException 400 for invalid UUID in path."""
-        request = MagicMock(spec=Request)
-        request.headers = {}
-        request.query_params = {}
-        request.path_params = {"project_id": "invalid-uuid"}
-        
-        call_next = AsyncMock()
-        
-        middleware = ProjectContextMiddleware(app=MagicMock())
-        
-        with pytest.raises(HTTPException) as exc_info:
-            await middleware.dispatch(request, call_next)
-        
-        assert exc_info.value.status_code == 400
-        assert "Invalid project ID format in path" in exc_info.value.detail
+    async def test_reuses_project_context_for_same_project(self):
+        """Should hand out one shared (frozen) ProjectContext per project_id."""
+        project_id = PROJECT_ID
+        first = make_scope(headers={"X-Project-ID": str(project_id)})
+        second = make_scope(query={"project_id": str(project_id)})
+
+        await run_middleware(ProjectContextMiddleware, first)
+        await run_middleware(ProjectContextMiddleware, second)
+
+        assert first["state"]["project_context"] is second["state"]["project_context"]
+
+    @pytest.mark.asyncio
+    async def test_responds_400_on_invalid_uuid_in_header(self, middleware):
+        """Should respond 400 for invalid UUID in header without calling the app."""
+        scope = make_scope(headers={"X-Project-ID": "invalid-uuid"})
+
+        status, body = await get_error_response(middleware, scope)
+
+        assert status == 400
+        assert "Invalid project ID format in header" in body["detail"]
+
+    @pytest.mark.asyncio
+    async def test_responds_400_on_non_canonical_uuid_in_header(self, middleware):
+        """Should reject UUID spellings other than 8-4-4-4-12 hex."""
+        project_id = PROJECT_ID
+
+        for non_canonical in (project_id.hex, f"{{{project_id}}}", f"urn:uuid:{project_id}"):
+            scope = make_scope(headers={"X-Project-ID": non_canonical})
+
+            status, _ = await get_error_response(middleware, scope)
+
+            assert status == 400
+
+    @pytest.mark.asyncio
+    async def test_accepts_uppercase_uuid_in_header(self):
+        """Should accept canonical UUIDs regardless of hex case."""
+        project_id = PROJECT_ID
+        scope = make_scope(headers={"X-Project-ID": str(project_id).upper()})
+
+        await run_middleware(ProjectContextMiddleware, scope)
+
+        assert scope["state"]["project_context"].project_id == project_id
+
+    @pytest.mark.asyncio
+    async def test_responds_400_on_invalid_uuid_in_query(self, middleware):
+        """Should respond 400 for invalid UUID in query."""
+        scope = make_scope(query={"project_id": "invalid-uuid"})
+
+        status, body = await get_error_response(middleware, scope)
+
+        assert status == 400
+        assert "Invalid project ID format in query" in body["detail"]
 
     @pytest.mark.asyncio
     async def test_leaves_project_context_unset_when_no_project_id(self):
         """Should leave project_context unset when no project_id found."""
-        request = MagicMock(spec=Request)
-        request.headers = {}
-        request.query_params = MagicMock()
-        request.query_params.get = MagicMock(return_value=None)
-        request.path_params = {}
-        
-        from types import SimpleNamespace
-        request.state = SimpleNamespace()
-        
-        call_next = AsyncMock(return_value=Response())
-        
-        middleware = ProjectContextMiddleware(app=MagicMock())
-        response = await middleware.dispatch(request, call_next)
-        
+        scope = make_scope()
+
+        app = await run_middleware(ProjectContextMiddleware, scope)
+
         # Should not have project_context set
-        assert not hasattr(request.state, "project_context")
-        call_next.assert_called_once()
+        assert "project_context" not in scope["state"]
+        app.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_handles_empty_header_gracefully(self):
         """Should handle empty header string gracefully."""
-        request = MagicMock(spec=Request)
-        request.headers = {"X-Project-ID": ""}
-        request.query_params = MagicMock()
-        request.query_params.get = MagicMock(return_value=None)
-        request.path_params = {}
-        
-        from types import SimpleNamespace
-        request.state = SimpleNamespace()
-        
-        call_next = AsyncMock(return_value=Response())
-        
-        middleware = ProjectContextMiddleware(app=MagicMock())
+        scope = make_scope(headers={"X-Project-ID": ""})
+
         # Should not raise, but also not set context
-        response = await middleware.dispatch(request, call_next)
-        
-        assert not hasattr(request.state, "project_context")
+        await run_middleware(ProjectContextMiddleware, scope)
+
+        assert "project_context" not in scope["state"]
+
+    @pytest.mark.asyncio
+    async def test_passes_through_non_http_scopes(self):
+        """Should forward non-HTTP scopes (e.g. lifespan) untouched."""
+        scope = {"type": "lifespan"}
+
+        app = await run_middleware(ProjectContextMiddleware, scope)
+
+        app.assert_called_once()
+        assert "state" not in scope
+
+    @pytest.mark.asyncio
+    async def test_skips_docs_paths_by_default(self):
+        """Should not parse (or reject) project IDs on API docs paths."""
+        for path in ("/docs", "/docs/oauth2-redirect", "/redoc", "/openapi.json"):
+            scope = make_scope(headers={"X-Project-ID": "invalid-uuid"}, path=path)
+
+            app = await run_middleware(ProjectContextMiddleware, scope)
+
+            app.assert_called_once()
+            assert "project_context" not in scope["state"]
+
+    @pytest.mark.asyncio
+    async def test_skips_custom_excluded_paths(self):
+        """Should pass through paths matching configured exclude_path_prefixes."""
+        app = AsyncMock()
+        middleware = ProjectContextMiddleware(app=app, exclude_path_prefixes=("/api/v1/health",))
+        excluded = make_scope(headers={"X-Project-ID": "invalid-uuid"}, path="/api/v1/health/db")
+        included = make_scope(headers={"X-Project-ID": "invalid-uuid"}, path="/docs")
+
+        await middleware(excluded, receive, discard)
+        status, _ = await get_error_response(middleware, included)
+
+        assert status == 400
+        app.assert_called_once()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "path, exclude_path_prefixes",
+        [
+            ("/api/v1/healthcare", ("/api/v1/health",)),
+            ("/api/v1/health-reports", ("/api/v1/health",)),
+            ("/docsearch", ("/docs",)),
+        ],
+    )
+    async def test_sets_context_for_sibling_of_excluded_path(self, path, exclude_path_prefixes):
+        """Should match excluded prefixes on whole path segments only."""
+        app = AsyncMock()
+        middleware = ProjectContextMiddleware(app=app, exclude_path_prefixes=exclude_path_prefixes)
+        scope = make_scope(headers={"X-Project-ID": str(PROJECT_ID)}, path=path)
+
+        await middleware(scope, receive, discard)
+
+        assert scope["state"]["project_context"].project_id == PROJECT_ID
+        app.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_skips_options_requests(self):
+        """Should not parse (or reject) project IDs on OPTIONS requests."""
+        scope = make_scope(headers={"X-Project-ID": "invalid-uuid"}, method="OPTIONS")
+
+        app = await run_middleware(ProjectContextMiddleware, scope)
+
+        app.assert_called_once()
+        assert "project_context" not in scope["state"]
 
 
 class TestCreateProjectContextMiddleware:
     """Tests for create_project_context_middleware factory."""
 
+    def test_returns_project_context_middleware_subclass(self):
+        """Should reuse ProjectContextMiddleware dispatch via a subclass."""
+        middleware_class = create_project_context_middleware(require_project_id=True)
+
+        assert issubclass(middleware_class, ProjectContextMiddleware)
+        assert "__call__" not in vars(middleware_class)
+
     @pytest.mark.asyncio
-    async def test_require_project_id_raises_400_when_missing(self):
-        """Should raise 400 when require_project_id=True and project_id missing."""
+    async def test_require_project_id_responds_400_when_missing(self):
+        """Should respond 400 when require_project_id=True and project_id missing."""
         middleware_class = create_project_context_middleware(require_project_id=True)
-        
-        request = MagicMock(spec=Request)
-        request.headers = {}
-        request.query_params = MagicMock()
-        request.query_params.get = MagicMock(return_value=None)
-        request.path_params = {}
-        
-        call_next = AsyncMock()
-        
-        middleware = middleware_class(app=MagicMock())
-        
-        with pytest.raises(HTTPException) as exc_info:
-            await middleware.dispatch(request, call_next)
-        
-        assert exc_info.value.status_code == 400
-        assert "Project ID is required" in exc_info.value.detail
+        app = AsyncMock()
+
+        status, body = await get_error_response(middleware_class(app=app), make_scope())
+
+        assert status == 400
+        assert "Project ID is required" in body["detail"]
+        app.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_require_project_id_skips_options_requests(self):
+        """Should let OPTIONS requests through without a project_id."""
+        middleware_class = create_project_context_middleware(require_project_id=True)
+
+        app = await run_middleware(middleware_class, make_scope(method="OPTIONS"))
+
+        app.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_require_project_id_skips_docs_paths(self):
+        """Should serve API docs without a project_id."""
+        middleware_class = create_project_context_middleware(require_project_id=True)
+
+        app = await run_middleware(middleware_class, make_scope(path="/openapi.json"))
+
+        app.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_require_project_id_skips_custom_excluded_paths(self):
+        """Should inherit exclude_path_prefixes handling (e.g. health checks)."""
+        middleware_class = create_project_context_middleware(require_project_id=True)
+        app = AsyncMock()
+        middleware = middleware_class(app=app, exclude_path_prefixes=("/api/v1/health",))
+
+        await middleware(make_scope(path="/api/v1/health"), receive, discard)
+
+        app.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_require_project_id_false_allows_missing(self):
         """Should allow missing project_id when require_project_id=False."""
         middleware_class = create_project_context_middleware(require_project_id=False)
-        
-        request = MagicMock(spec=Request)
-        request.headers = {}
-        request.query_params = MagicMock()
-        request.query_params.get = MagicMock(return_value=None)
-        request.path_params = {}
-        
-        from types import SimpleNamespace
-        request.state = SimpleNamespace()
-        
-        call_next = AsyncMock(return_value=Response())
-        
-        middleware = middleware_class(app=MagicMock())
-        response = await middleware.dispatch(request, call_next)
-        
+        scope = make_scope()
+
+        app = await run_middleware(middleware_class, scope)
+
         # Should not raise and not set context
-        assert not hasattr(request.state, "project_context")
-        call_next.assert_called_once()
+        assert "project_context" not in scope["state"]
+        app.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_uses_default_project_id_when_provided(self):
         """Should use default_project_id when project_id missing and default provided."""
-        default_id = uuid.uuid4()
+        default_id = OTHER_PROJECT_ID
         middleware_class = create_project_context_middleware(
             require_project_id=False,
             default_project_id=default_id
         )
-        
-        request = MagicMock(spec=Request)
-        request.headers = {}
-        request.query_params = MagicMock()
-        request.query_params.get = MagicMock(return_value=None)
-        request.path_params = {}
-        
-        from types import SimpleNamespace
-        request.state = SimpleNamespace()
-        
-        call_next = AsyncMock(return_value=Response())
-        
-        middleware = middleware_class(app=MagicMock())
-        response = await middleware.dispatch(request, call_next)
-        
-        assert request.state.project_context.project_id == default_id
+        scope = make_scope()
+
+        await run_middleware(middleware_class, scope)
+
+        assert scope["state"]["project_context"].project_id == default_id
 
     @pytest.mark.asyncio
     async def test_prefers_extracted_over_default_project_id(self):
         """Should prefer extracted project_id over default."""
-        extracted_id = uuid.uuid4()
-        default_id = uuid.uuid4()
-        
+        extracted_id = PROJECT_ID
+        default_id = OTHER_PROJECT_ID
+
         middleware_class = create_project_context_middleware(
             require_project_id=False,
             default_project_id=default_id
         )
-        
-        request = MagicMock(spec=Request)
-        request.headers = {"X-Project-ID": str(extracted_id)}
-        request.query_params = MagicMock()
-        request.query_params.get = MagicMock(return_value=None)
-        request.path_params = {}
-        
-        from types import SimpleNamespace
-        request.state = SimpleNamespace()
-        
-        call_next = AsyncMock(return_value=Response())
-        
-        middleware = middleware_class(app=MagicMock())
-        response = await middleware.dispatch(request, call_next)
-        
-        assert request.state.project_context.project_id == extracted_id
+        scope = make_scope(headers={"X-Project-ID": str(extracted_id)})
+
+        await run_middleware(middleware_class, scope)
+
+        assert scope["state"]["project_context"].project_id == extracted_id
 
     @pytest.mark.asyncio
     async def test_require_project_id_overrides_default(self):
         """Should require project_id even if default is provided."""
-        default_id = uuid.uuid4()
+        default_id = OTHER_PROJECT_ID
         middleware_class = create_project_context_middleware(
             require_project_id=True,
             default_project_id=default_id
         )
-        
-        request = MagicMock(spec=Request)
-        request.headers = {}
-        request.query_params = MagicMock()
-        request.query_params.get = MagicMock(return_value=None)
-        request.path_params = {}
-        
-        call_next = AsyncMock()
-        
-        middleware = middleware_class(app=MagicMock())
-        
-        with pytest.raises(HTTPException) as exc_info:
-            await middleware.dispatch(request, call_next)
-        
-        assert exc_info.value.status_code == 400
+
+        status, _ = await get_error_response(middleware_class(app=unreachable_app), make_scope())
+
         # Should not use default when require_project_id=True
+        assert status == 400
 
     @pytest.mark.asyncio
     async def test_still_validates_uuid_format(self):
         """Should still validate UUID format even with default provided."""
-        default_id = uuid.uuid4()
+        default_id = OTHER_PROJECT_ID
         middleware_class = create_project_context_middleware(
             require_project_id=False,
             default_project_id=default_id
         )
-        
-        request = MagicMock(spec=Request)
-        request.headers = {"X-Project-ID": "invalid-uuid"}
-        request.query_params = MagicMock()
-        request.query_params.get = MagicMock(return_value=None)
-        request.path_params = {}
-        
-        call_next = AsyncMock()
-        
-        middleware = middleware_class(app=MagicMock())
-        
-        with pytest.raises(HTTPException) as exc_info:
-            await middleware.dispatch(request, call_next)
-        
-        assert exc_info.value.status_code == 400
-        assert "Invalid project ID format" in exc_info.value.detail
+        scope = make_scope(headers={"X-Project-ID": "invalid-uuid"})
+
+        status, body = await get_error_response(middleware_class(app=unreachable_app), scope)
+
+        assert status == 400
+        assert "Invalid project ID format" in body["detail"]
+
+
+class TestProjectContextMiddlewareIntegration:
+    """Tests for ProjectContextMiddleware mounted on a FastAPI app."""
+
+    @pytest.mark.asyncio
+    async def test_context_reaches_get_project_context(self):
+        """Should expose the context to get_project_context via request.state."""
+        from fastapi import Depends, FastAPI
+        from httpx import ASGITransport, AsyncClient
+
+        from app.deps.project import get_project_context
+
+        app = FastAPI()
+        app.add_middleware(ProjectContextMiddleware)
+
+        @app.get("/context")
+        async def read_context(context: ProjectContext = Depends(get_project_context)):
+            return {"project_id": str(context.project_id)}
+
+        project_id = PROJECT_ID
+        async with AsyncClient(
+            transport=ASGITransport(app=app),
+            base_url="http://test",
+        ) as client:
+            response = await client.get(
+                "/context",
+                headers={"X-Project-ID": str(project_id)},
+            )
+
+        assert response.status_code == 200
+        assert response.json() == {"project_id": str(project_id)}
+
+    @pytest.mark.asyncio
+    async def test_path_project_id_resolved_after_routing(self):
+        """Should resolve a project_id path parameter in get_project_context."""
+        from fastapi import Depends, FastAPI
+        from httpx import ASGITransport, AsyncClient
+
+        from app.deps.project import get_project_context
+
+        app = FastAPI()
+        app.add_middleware(ProjectContextMiddleware)
+
+        @app.get("/projects/{project_id}/context")
+        async def read_context(context: ProjectContext = Depends(get_project_context)):
+            return {"project_id": str(context.project_id)}
+
+        project_id = PROJECT_ID
+        async with AsyncClient(
+            transport=ASGITransport(app=app),
+            base_url="http://test",
+        ) as client:
+            response = await client.get(f"/projects/{project_id}/context")
+            invalid = await client.get("/projects/not-a-uuid/context")
+
+        assert response.status_code == 200
+        assert response.json() == {"project_id": str(project_id)}
+        assert invalid.status_code == 400
+        assert "Invalid project ID format in path" in invalid.json()["detail"]
+
+    @pytest.mark.asyncio
+    async def test_invalid_header_returns_400_response(self):
+        """Should reach the client as a 400, not as an unhandled middleware error."""
+        from fastapi import FastAPI
+        from httpx import ASGITransport, AsyncClient
+
+        app = FastAPI()
+        app.add_middleware(ProjectContextMiddleware)
+
+        @app.get("/context")
+        async def read_context():
+            return {}
+
+        async with AsyncClient(
+            transport=ASGITransport(app=app),
+            base_url="http://test",
+        ) as client:
+            response = await client.get("/context", headers={"X-Project-ID": "invalid-uuid"})
+
+        assert response.status_code == 400
+        assert response.json() == {"detail": "Invalid project ID format in header: invalid-uuid"}
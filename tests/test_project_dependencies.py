@@ -8,43 +8,47 @@ Tests cover:
 - Error handling for missing/invalid UUIDs
 """
 
+import asyncio
 import uuid
 
 import pytest
 from fastapi import APIRouter, Depends, FastAPI
 from httpx import AsyncClient, ASGITransport
 
-
 from app.deps.project import (
+    _parse_uuid_cached,
     get_project_id_from_header,
     get_project_id_from_path,
     get_project_id_from_query,
 )
 
 
-@pytest.fixture
+# The routes are read-only, so one app and client serve the whole module.
+@pytest.fixture(scope="module")
 def test_app() -> FastAPI:
     """Create a test FastAPI app with test routes."""
+    # Return annotations let FastAPI serialize (UUIDs included) straight to
+    # JSON bytes through Pydantic instead of jsonable_encoder + json.dumps.
     app = FastAPI()
     router = APIRouter()
 
     @router.get("/header")
-    async def test_header(project_id: uuid.UUID = Depends(get_project_id_from_header)):
-        return {"project_id": str(project_id)}
+    async def test_header(project_id: uuid.UUID = Depends(get_project_id_from_header)) -> dict[str, uuid.UUID]:
+        return {"project_id": project_id}
 
     @router.get("/query")
-    async def test_query(project_id: uuid.UUID = Depends(get_project_id_from_query)):
-        return {"project_id": str(project_id)}
+    async def test_query(project_id: uuid.UUID = Depends(get_project_id_from_query)) -> dict[str, uuid.UUID]:
+        return {"project_id": project_id}
 
     @router.get("/path/{project_id}")
-    async def test_path(project_id: uuid.UUID = Depends(get_project_id_from_path)):
-        return {"project_id": str(project_id)}
+    async def test_path(project_id: uuid.UUID = Depends(get_project_id_from_path)) -> dict[str, uuid.UUID]:
+        return {"project_id": project_id}
 
     app.include_router(router)
     return app
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 async def client(test_app: FastAPI) -> AsyncClient:
     transport = ASGITransport(app=test_app)
 
@@ -55,7 +59,6 @@ async def client(test_app: FastAPI) -> AsyncClient:
         yield client
 
 
-
 class TestProjectIDFromHeader:
     """Tests for get_project_id_from_header dependency."""
 
@@ -98,22 +101,57 @@ class TestProjectIDFromHeader:
         assert response.status_code == 400
         assert "X-Project-ID header is required" in response.json()["detail"]
 
-    async def test_malformed_uuid_returns_400(self, client: AsyncClient):
-        """Should return 400 for malformed UUID strings."""
-        test_cases = [
+    @pytest.mark.parametrize(
+        "invalid_uuid",
+        [
             "12345",  # Too short
             "00000000-0000-0000-0000-000000000000-extra",  # Too long
             "gggggggg-gggg-gggg-gggg-gggggggggggg",  # Invalid hex
             "12345678-1234-1234-1234-1234567890123",  # Wrong length
+        ],
+    )
+    async def test_malformed_uuid_returns_400(self, client: AsyncClient, invalid_uuid: str):
+        """Should return 400 for malformed UUID strings."""
+        response = await client.get(
+            "/header",
+            headers={"X-Project-ID": invalid_uuid},
+        )
+
+        assert response.status_code == 400
+        assert "Invalid project ID format" in response.json()["detail"]
+
+    async def test_non_canonical_uuid_returns_400(self, client: AsyncClient):
+        """Should return 400 for UUID spellings other than 8-4-4-4-12 hex."""
+        project_id = uuid.uuid4()
+        test_cases = [
+            project_id.hex,  # No dashes
+            f"{{{project_id}}}",  # Braces
+            f"urn:uuid:{project_id}",  # URN prefix
         ]
 
-        for invalid_uuid in test_cases:
+        responses = await asyncio.gather(
+            *(client.get("/header", headers={"X-Project-ID": value}) for value in test_cases)
+        )
+
+        for response in responses:
+            assert response.status_code == 400
+            assert "Invalid project ID format" in response.json()["detail"]
+
+    async def test_repeated_project_id_is_parsed_once(self, client: AsyncClient):
+        """Should serve repeated project IDs from the parse cache."""
+        project_id = uuid.uuid4()
+        _parse_uuid_cached.cache_clear()
+
+        for _ in range(3):
             response = await client.get(
                 "/header",
-                headers={"X-Project-ID": invalid_uuid},
+                headers={"X-Project-ID": str(project_id)},
             )
-            assert response.status_code == 400
-            assert "Invalid project ID format" in response.json()["detail"]
+            assert response.status_code == 200
+
+        cache_info = _parse_uuid_cached.cache_info()
+        assert cache_info.misses == 1
+        assert cache_info.hits == 2
 
 
 class TestProjectIDFromQuery:
@@ -181,18 +219,20 @@ class TestProjectIDFromPath:
         assert "Invalid project ID format" in response.json()["detail"]
         assert "not-a-valid-uuid" in response.json()["detail"]
 
-    async def test_malformed_uuid_in_path_returns_400(self, client: AsyncClient):
-        """Should return 400 for malformed UUID in path."""
-        test_cases = [
+    @pytest.mark.parametrize(
+        "invalid_uuid",
+        [
             "12345",
             "00000000-0000-0000-0000-000000000000-extra",
             "gggggggg-gggg-gggg-gggg-gggggggggggg",
-        ]
+        ],
+    )
+    async def test_malformed_uuid_in_path_returns_400(self, client: AsyncClient, invalid_uuid: str):
+        """Should return 400 for malformed UUID in path."""
+        response = await client.get(f"/path/{invalid_uuid}")
 
-        for invalid_uuid in test_cases:
-            response = await client.get(f"/path/{invalid_uuid}")
-            assert response.status_code == 400
-            assert "Invalid project ID format" in response.json()["detail"]
+        assert response.status_code == 400
+        assert "Invalid project ID format" in response.json()["detail"]
 
     async def test_uppercase_uuid_works(self, client: AsyncClient):
         """Should accept uppercase UUID format."""
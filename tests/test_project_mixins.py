@@ -1,11 +1,13 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import ForeignKey, DateTime, Boolean
+from sqlalchemy import ForeignKey, DateTime
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import Mapped, mapped_column, declarative_mixin
+from sqlalchemy.orm import Mapped, mapped_column, declarative_mixin, declared_attr
 
 from app.db.base import Base
+from app.models.base_project import project_active_index
 
 
 # -------------------------
@@ -44,16 +46,21 @@ class ProjectScopedMixin:
 @declarative_mixin
 class SoftDeleteMixin:
 
+    # Not indexed on its own; see BaseProjectModelWithSoftDelete's partial index
     deleted_at: Mapped[datetime | None] = mapped_column(
         DateTime,
         nullable=True,
-        index=True,
     )
 
-    is_deleted: Mapped[bool] = mapped_column(
-        Boolean,
-        default=False,
-    )
+    # Derived from deleted_at rather than stored: one column to write on delete
+    @hybrid_property
+    def is_deleted(self) -> bool:
+        return self.deleted_at is not None
+
+    @is_deleted.inplace.expression
+    @classmethod
+    def _is_deleted_expression(cls):
+        return cls.deleted_at.is_not(None)
 
 
 # -------------------------
@@ -70,3 +77,8 @@ class BaseProjectModelWithSoftDelete(
     BaseUUIDModel,
 ):
     __abstract__ = True
+
+    @declared_attr.directive
+    def __table_args__(cls) -> tuple:
+        # Same partial index as the app's BaseProjectModelWithSoftDelete
+        return (project_active_index(cls),)
@@ -5,10 +5,11 @@ Tests cover get_repository_factory, create_repository_dependency, and get_reposi
 from app/deps/repository.py.
 """
 
+import inspect
 import uuid
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
-from fastapi import HTTPException, Depends
+from unittest.mock import MagicMock
+from fastapi import HTTPException
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -23,7 +24,8 @@ from app.repositories.base import BaseRepository
 
 # Mock repository class for testing
 class MockModel:
-    """Mock model for testing."""
+    """Mock model for testing (never instantiated, so no instance dict)."""
+    __slots__ = ()
     project_id = None  # Attribute exists for hasattr check
 
 
@@ -35,153 +37,135 @@ class MockRepository(BaseRepository[MockModel]):
         super().__init__(session, project_id, MockModel)
 
 
+class _ValueErrorRepo(BaseRepository[MockModel]):
+    """Repository whose construction fails validation."""
+
+    def __init__(self, session: AsyncSession, project_id: uuid.UUID):
+        raise ValueError("Invalid project_id")
+
+
+class _RuntimeErrorRepo(BaseRepository[MockModel]):
+    """Repository whose construction fails unexpectedly."""
+
+    def __init__(self, session: AsyncSession, project_id: uuid.UUID):
+        raise RuntimeError("Unexpected")
+
+
+@pytest.fixture(scope="module")
+def mock_session() -> MagicMock:
+    """Bare session stand-in: repositories only store it, nothing is awaited."""
+    return MagicMock()
+
+
+@pytest.fixture(scope="module")
+def project_id() -> uuid.UUID:
+    """Shared project ID; tests only compare it within themselves."""
+    return uuid.uuid4()
+
+
+@pytest.fixture(scope="module")
+def project_context(project_id: uuid.UUID) -> ProjectContext:
+    """Project context wrapping the shared project_id."""
+    return ProjectContext(project_id=project_id)
+
+
+@pytest.fixture(scope="module")
+def factory():
+    """The (memoized) factory for MockRepository."""
+    return get_repository_factory(MockRepository)
+
+
+@pytest.fixture(scope="module")
+async def built_repo(factory, mock_session, project_context) -> MockRepository:
+    """Repository built once through the factory; tests only read from it."""
+    return await factory(session=mock_session, context=project_context)
+
+
 class TestGetRepositoryFactory:
     """Tests for get_repository_factory function."""
 
-    def test_creates_factory_function(self):
+    def test_creates_factory_function(self, factory):
         """Should create a factory function for the repository class."""
-        factory = get_repository_factory(MockRepository)
-        
         assert callable(factory)
+        # Coroutine function, so FastAPI doesn't dispatch it to the threadpool
+        assert inspect.iscoroutinefunction(factory)
         # Factory should have Depends annotations
         assert hasattr(factory, "__annotations__")
 
-    @pytest.mark.asyncio
-    async def test_factory_creates_repository_with_injected_dependencies(self):
+    def test_factory_creates_repository_with_injected_dependencies(
+        self, built_repo, mock_session, project_id
+    ):
         """Should create repository instance with injected session and context."""
-        project_id = uuid.uuid4()
-        mock_session = AsyncMock(spec=AsyncSession)
-        mock_context = ProjectContext(project_id=project_id)
-        
-        factory = get_repository_factory(MockRepository)
-        
-        # Call factory with mocked dependencies
-        repo = factory(session=mock_session, context=mock_context)
-        
-        assert isinstance(repo, MockRepository)
-        assert repo.session == mock_session
-        assert repo.project_id == project_id
+        assert isinstance(built_repo, MockRepository)
+        assert built_repo.session is mock_session
+        assert built_repo.project_id == project_id
 
     @pytest.mark.asyncio
-    async def test_factory_raises_http_exception_on_value_error(self):
+    async def test_factory_raises_http_exception_on_value_error(self, mock_session, project_context):
         """Should raise HTTPException 500 when repository raises ValueError."""
-        project_id = uuid.uuid4()
-        mock_session = AsyncMock(spec=AsyncSession)
-        mock_context = ProjectContext(project_id=project_id)
-        
-        # Mock repository to raise ValueError
-        with patch.object(MockRepository, "__init__", side_effect=ValueError("Invalid project_id")):
-            factory = get_repository_factory(MockRepository)
-            
-            with pytest.raises(HTTPException) as exc_info:
-                factory(session=mock_session, context=mock_context)
-            
-            assert exc_info.value.status_code == 500
-            assert "Failed to initialize repository" in exc_info.value.detail
+        factory = get_repository_factory(_ValueErrorRepo)
+        # str(HTTPException) is "<status_code>: <detail>"
+        with pytest.raises(HTTPException, match="^500: Failed to initialize repository"):
+            await factory(session=mock_session, context=project_context)
 
     @pytest.mark.asyncio
-    async def test_factory_raises_http_exception_on_unexpected_error(self):
+    async def test_factory_raises_http_exception_on_unexpected_error(self, mock_session, project_context):
         """Should raise HTTPException 500 on unexpected errors."""
-        project_id = uuid.uuid4()
-        mock_session = AsyncMock(spec=AsyncSession)
-        mock_context = ProjectContext(project_id=project_id)
-        
-        # Mock repository to raise unexpected error
-        with patch.object(MockRepository, "__init__", side_effect=RuntimeError("Unexpected")):
-            factory = get_repository_factory(MockRepository)
-            
-            with pytest.raises(HTTPException) as exc_info:
-                factory(session=mock_session, context=mock_context)
-            
-            assert exc_info.value.status_code == 500
-            assert "Failed to create repository instance" in exc_info.value.detail
-
-    def test_factory_uses_depends_for_session_and_context(self):
+        factory = get_repository_factory(_RuntimeErrorRepo)
+        with pytest.raises(HTTPException, match="^500: Failed to create repository instance"):
+            await factory(session=mock_session, context=project_context)
+
+    def test_returns_same_factory_for_same_class(self):
+        """Should memoize the factory so FastAPI can dedupe it per request."""
+        assert get_repository_factory(MockRepository) is get_repository_factory(MockRepository)
+        assert create_repository_dependency(MockRepository) is get_repository_factory(MockRepository)
+
+    def test_factory_uses_depends_for_session_and_context(self, factory):
         """Should use Depends for session and context parameters."""
-        factory = get_repository_factory(MockRepository)
-        
-        # Check that factory signature includes Depends
-        import inspect
-        sig = inspect.signature(factory)
-        
         # Parameters should exist (Depends is handled at runtime)
-        assert "session" in sig.parameters
-        assert "context" in sig.parameters
+        assert "session" in factory.__annotations__
+        assert "context" in factory.__annotations__
 
 
 class TestCreateRepositoryDependency:
     """Tests for create_repository_dependency alias."""
 
-    def test_is_alias_for_get_repository_factory(self):
+    @pytest.mark.asyncio
+    async def test_is_alias_for_get_repository_factory(self, mock_session, project_context, built_repo):
         """Should return same result as get_repository_factory."""
-        factory1 = get_repository_factory(MockRepository)
-        factory2 = create_repository_dependency(MockRepository)
+        alias_factory = create_repository_dependency(MockRepository)
+        assert callable(alias_factory)
         
-        # Both should be callable factory functions
-        assert callable(factory1)
-        assert callable(factory2)
+        # It should behave the same way as the factory that built built_repo
+        repo = await alias_factory(session=mock_session, context=project_context)
         
-        # They should behave the same way
-        project_id = uuid.uuid4()
-        mock_session = AsyncMock(spec=AsyncSession)
-        mock_context = ProjectContext(project_id=project_id)
-        
-        repo1 = factory1(session=mock_session, context=mock_context)
-        repo2 = factory2(session=mock_session, context=mock_context)
-        
-        assert isinstance(repo1, MockRepository)
-        assert isinstance(repo2, MockRepository)
-        assert repo1.project_id == repo2.project_id
+        assert isinstance(repo, MockRepository)
+        assert repo.project_id == built_repo.project_id
 
 
 class TestGetRepository:
     """Tests for get_repository direct function."""
 
-    def test_creates_repository_instance(self):
-        """Should create repository instance directly."""
-        project_id = uuid.uuid4()
-        mock_session = AsyncMock(spec=AsyncSession)
+    def test_creates_repository_instance(self, mock_session, project_id):
+        """Should create repository instances that keep their own session and project_id."""
+        other_session = MagicMock()
+        other_project_id = uuid.uuid4()
         
-        repo = get_repository(MockRepository, mock_session, project_id)
+        repo1 = get_repository(MockRepository, mock_session, project_id)
+        repo2 = get_repository(MockRepository, other_session, other_project_id)
         
-        assert isinstance(repo, MockRepository)
-        assert repo.session == mock_session
-        assert repo.project_id == project_id
+        assert isinstance(repo1, MockRepository)
+        assert repo1.session is mock_session
+        assert repo1.project_id == project_id
+        assert repo2.session is other_session
+        assert repo2.project_id == other_project_id
 
-    def test_raises_value_error_on_repository_value_error(self):
+    def test_raises_value_error_on_repository_value_error(self, mock_session, project_id):
         """Should raise ValueError when repository raises ValueError."""
-        project_id = uuid.uuid4()
-        mock_session = AsyncMock(spec=AsyncSession)
-        
-        # Mock repository to raise ValueError
-        with patch.object(MockRepository, "__init__", side_effect=ValueError("Invalid")):
-            with pytest.raises(ValueError, match="Invalid"):
-                get_repository(MockRepository, mock_session, project_id)
+        with pytest.raises(ValueError, match="Invalid"):
+            get_repository(_ValueErrorRepo, mock_session, project_id)
 
-    def test_raises_http_exception_on_unexpected_error(self):
+    def test_raises_http_exception_on_unexpected_error(self, mock_session, project_id):
         """Should raise HTTPException 500 on unexpected errors."""
-        project_id = uuid.uuid4()
-        mock_session = AsyncMock(spec=AsyncSession)
-        
-        # Mock repository to raise unexpected error
-        with patch.object(MockRepository, "__init__", side_effect=RuntimeError("Unexpected")):
-            with pytest.raises(HTTPException) as exc_info:
-                get_repository(MockRepository, mock_session, project_id)
-            
-            assert exc_info.value.status_code == 500
-            assert "Failed to create repository instance" in exc_info.value.detail
-
-    def test_uses_provided_session_and_project_id(self):
-        """Should use provided session and project_id without dependency injection."""
-        project_id1 = uuid.uuid4()
-        project_id2 = uuid.uuid4()
-        mock_session1 = AsyncMock(spec=AsyncSession)
-        mock_session2 = AsyncMock(spec=AsyncSession)
-        
-        repo1 = get_repository(MockRepository, mock_session1, project_id1)
-        repo2 = get_repository(MockRepository, mock_session2, project_id2)
-        
-        assert repo1.session == mock_session1
-        assert repo1.project_id == project_id1
-        assert repo2.session == mock_session2
-        assert repo2.project_id == project_id2
+        with pytest.raises(HTTPException, match="^500: Failed to create repository instance"):
+            get_repository(_RuntimeErrorRepo, mock_session, project_id)